@@ -0,0 +1 @@
+"""Benchmarks for the vsstubs generation pipeline."""
@@ -0,0 +1,59 @@
+"""
+Compare an incremental update of the stubs with a full reconstruction when a single plugin changed.
+
+Run with `python -m benchmarks.bench_incremental`.
+The incremental update fingerprints every plugin and only constructs the changed one,
+while the full reconstruction constructs and renders every plugin again.
+"""
+
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from unittest.mock import patch
+
+from vsstubs.func import output_stubs
+from vsstubs.types import PluginInterface
+
+from .synthetic import make_interface
+
+
+def _interfaces(n_plugins: int, n_functions: int, changed: str | None = None) -> list[PluginInterface]:
+    interfaces = [make_interface(n_functions, f"plugin{p:05}") for p in range(n_plugins)]
+
+    return [
+        interface._replace(description="Changed") if interface.namespace == changed else interface
+        for interface in interfaces
+    ]
+
+
+def main(sizes: tuple[int, ...] = (20, 50, 100), n_functions: int = 200, repeat: int = 3) -> None:
+    print(f"{'plugins':>8} {'full (ms)':>10} {'incremental (ms)':>17}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stubs, full, incremental = (Path(tmp, name) for name in ("stubs.pyi", "full.pyi", "incremental.pyi"))
+
+        for n in sizes:
+            with patch("vsstubs.func._get_pinters", return_value=_interfaces(n, n_functions)):
+                output_stubs(None, stubs)
+
+            with patch("vsstubs.func._get_pinters", return_value=_interfaces(n, n_functions, "plugin00000")):
+                timings = [
+                    min(timeit.repeat(lambda: output_stubs(None, full), number=1, repeat=repeat)),
+                    min(
+                        timeit.repeat(
+                            lambda: output_stubs(stubs, incremental, update=True, incremental=True),
+                            number=1,
+                            repeat=repeat,
+                        )
+                    ),
+                ]
+
+            if full.read_text() != incremental.read_text():
+                raise SystemExit("The incremental update doesn't match the full reconstruction.")
+
+            print(f"{n:>8} {timings[0] * 1e3:>10.1f} {timings[1] * 1e3:>17.1f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Time constructing the implementations of a few hundred synthetic plugins in the current process and with `jobs`.
+
+Run with `python -m benchmarks.bench_jobs [jobs]`, `jobs` defaulting to the number of CPUs.
+Both ways must construct the same implementations.
+The timing with `jobs` includes spawning the processes, so the speedup shows on machines with 8 cores or more.
+"""
+
+import os
+import sys
+import timeit
+
+from vsstubs.stubs import _format_annotation, construct_implementations
+from vsstubs.types import Implementation, PluginInterface, parse_type
+
+from .synthetic import make_interface
+
+
+def _construct_serially(interfaces: list[PluginInterface]) -> list[Implementation]:
+    # Each run starts from empty caches, like a new process would.
+    parse_type.cache_clear()
+    _format_annotation.cache_clear()
+    return construct_implementations(interfaces, compat=False)
+
+
+def main(jobs: int = os.cpu_count() or 1, n_plugins: int = 300, n_functions: int = 100, repeat: int = 3) -> None:
+    interfaces = [make_interface(n_functions, f"plugin{p:05}") for p in range(n_plugins)]
+
+    if _construct_serially(interfaces) != construct_implementations(interfaces, compat=False, jobs=jobs):
+        raise SystemExit("The implementations constructed with jobs don't match.")
+
+    serial = min(timeit.repeat(lambda: _construct_serially(interfaces), number=1, repeat=repeat))
+    parallel = min(
+        timeit.repeat(lambda: construct_implementations(interfaces, compat=False, jobs=jobs), number=1, repeat=repeat)
+    )
+
+    print(f"{'plugins':>8} {'jobs':>5} {'serial (ms)':>12} {'jobs (ms)':>10} {'speedup':>8}", file=sys.stderr)
+    print(
+        f"{n_plugins:>8} {jobs:>5} {serial * 1e3:>12.1f} {parallel * 1e3:>10.1f} {serial / parallel:>7.1f}x",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
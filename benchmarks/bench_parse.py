@@ -0,0 +1,29 @@
+"""
+Time `get_implementations_from_input` on synthetic stubs of growing size.
+
+Run with `python -m benchmarks.bench_parse`.
+The time per plugin should stay roughly constant if parsing scales linearly.
+"""
+
+import sys
+import timeit
+from functools import partial
+
+from vsstubs.document import get_implementations_from_input
+
+from .synthetic import make_implementations, make_stub_text
+
+
+def main(sizes: tuple[int, ...] = (10, 50, 100, 250, 500, 1000, 2000), repeat: int = 3) -> None:
+    print(f"{'plugins':>8} {'size (KiB)':>11} {'total (ms)':>11} {'per plugin (us)':>16}", file=sys.stderr)
+
+    for n in sizes:
+        text = make_stub_text(make_implementations(n))
+
+        best = min(timeit.repeat(partial(get_implementations_from_input, text), number=1, repeat=repeat))
+
+        print(f"{n:>8} {len(text) / 1024:>11.0f} {best * 1e3:>11.2f} {best / n * 1e6:>16.1f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
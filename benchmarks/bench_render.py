@@ -0,0 +1,60 @@
+"""
+Time filling the blocks of the stub template with `write_stubs` for a growing number of plugins.
+
+Run with `python -m benchmarks.bench_render`.
+It's compared with substituting the implementations block and each plugin bound block with `re.sub`,
+which copies the whole text and parses the replacement once per block.
+The time per plugin of `write_stubs` should stay roughly constant.
+"""
+
+import re
+import sys
+import timeit
+
+from vsstubs.constants import _CORE_IMPL_END, _CORE_IMPL_START, _CORE_NAMES, _PLUGINS_IMPL_END, _PLUGINS_IMPL_START
+from vsstubs.stubs import _get_attributes, _implementations_body, _plugins_bound_bodies, write_stubs
+from vsstubs.types import Implementation
+
+from .synthetic import make_implementations, make_stub_text
+
+
+def _write_with_re_sub(implementations: list[Implementation], template: str) -> str:
+    bodies = _implementations_body(implementations) | _plugins_bound_bodies(_get_attributes(implementations))
+
+    for start, end in [
+        (_PLUGINS_IMPL_START, _PLUGINS_IMPL_END),
+        *((_CORE_IMPL_START.format(core_name=c), _CORE_IMPL_END.format(core_name=c)) for c in _CORE_NAMES),
+    ]:
+        template = re.sub(rf"{start}.*{end}", f"{start}\n{bodies[start]}\n{end}", template, flags=re.DOTALL)
+
+    return template
+
+
+def main(sizes: tuple[int, ...] = (10, 50, 100, 250, 500, 1000, 2000), repeat: int = 3) -> None:
+    template = make_stub_text([])
+
+    print(
+        f"{'plugins':>8} {'size (KiB)':>11} {'re.sub (ms)':>12} {'write_stubs (ms)':>17} {'per plugin (us)':>16}",
+        file=sys.stderr,
+    )
+
+    for n in sizes:
+        implementations = make_implementations(n)
+        output = write_stubs(implementations, template)
+
+        if _write_with_re_sub(implementations, template) != output:
+            raise SystemExit("write_stubs doesn't match re.sub.")
+
+        re_sub, slots = (
+            min(timeit.repeat(lambda write=write: write(implementations, template), number=1, repeat=repeat))  # noqa: B023
+            for write in (_write_with_re_sub, write_stubs)
+        )
+
+        print(
+            f"{n:>8} {len(output) / 1024:>11.0f} {re_sub * 1e3:>12.2f} {slots * 1e3:>17.2f} {slots / n * 1e6:>16.1f}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
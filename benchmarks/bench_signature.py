@@ -0,0 +1,57 @@
+"""
+Time rendering the function signatures of a synthetic 10,000-function interface.
+
+Run with `python -m benchmarks.bench_signature`.
+The direct renderer used by `construct_implementation` is compared with building an `inspect.Signature`
+for every function and calling `str` on it, and both must render the same text.
+"""
+
+import sys
+import timeit
+from inspect import Parameter
+
+from vsstubs.stubs import _render_signature
+from vsstubs.types import FunctionInterface, parse_type
+
+from .synthetic import make_interface
+
+
+def _render_with_signature(function: FunctionInterface) -> str:
+    parameters = [p.replace(annotation=parse_type(p.annotation)) for p in function.signature.parameters.values()]
+    signature = function.signature.replace(
+        parameters=(Parameter("self", Parameter.POSITIONAL_ONLY), *parameters),
+        return_annotation=parse_type(function.signature.return_annotation, True),
+    )
+    return str(signature)
+
+
+def _render_direct(function: FunctionInterface) -> str:
+    return _render_signature(
+        ((p, parse_type(p.annotation)) for p in function.signature.parameters.values()),
+        parse_type(function.signature.return_annotation, True),
+    )
+
+
+def main(n_functions: int = 10_000, repeat: int = 5) -> None:
+    functions = make_interface(n_functions).functions["VideoNode"]
+
+    if [_render_with_signature(f) for f in functions] != [_render_direct(f) for f in functions]:
+        raise SystemExit("The direct renderer doesn't match str(Signature).")
+
+    timings = {}
+
+    for name, render in [("signature", _render_with_signature), ("direct", _render_direct)]:
+        timings[name] = min(
+            timeit.repeat(lambda render=render: [render(f) for f in functions], number=1, repeat=repeat)
+        )
+
+    print(f"{'functions':>10} {'signature (ms)':>15} {'direct (ms)':>12} {'speedup':>8}", file=sys.stderr)
+    print(
+        f"{n_functions:>10} {timings['signature'] * 1e3:>15.1f} {timings['direct'] * 1e3:>12.1f}"
+        f" {timings['signature'] / timings['direct']:>7.1f}x",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
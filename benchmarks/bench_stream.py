@@ -0,0 +1,63 @@
+"""
+Measure the peak memory of writing the stubs of a growing number of synthetic plugins.
+
+Run with `python -m benchmarks.bench_stream`.
+The plugins are built lazily one at a time, like the plugins introspected by `output_stubs(..., stream=True)`.
+Constructing every implementation before writing the stubs holds all of them and the whole text at once,
+while the peak of `stream_stubs` should stay close to what a single plugin needs.
+"""
+
+import io
+import os
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from typing import IO
+
+from vsstubs.stubs import construct_implementation, stream_stubs, write_stubs
+from vsstubs.types import PluginInterface
+
+from .synthetic import make_interface, make_stub_text
+
+
+def _iter_interfaces(n_plugins: int, n_functions: int) -> Iterator[PluginInterface]:
+    for p in range(n_plugins):
+        yield make_interface(n_functions, f"plugin{p:05}")
+
+
+def _write_all(interfaces: Iterator[PluginInterface], template: str, output: IO[str]) -> None:
+    output.write(write_stubs([construct_implementation(i, compat=False) for i in interfaces], template))
+
+
+def _stream(interfaces: Iterator[PluginInterface], template: str, output: IO[str]) -> None:
+    stream_stubs(interfaces, template, output, compat=False)
+
+
+def main(sizes: tuple[int, ...] = (50, 100, 250, 500), n_functions: int = 50) -> None:
+    template = make_stub_text([])
+
+    print(f"{'plugins':>8} {'write_stubs (MiB)':>18} {'stream_stubs (MiB)':>19}", file=sys.stderr)
+
+    for n in sizes:
+        outputs = [io.StringIO(), io.StringIO()]
+
+        for write, output in zip((_write_all, _stream), outputs, strict=True):
+            write(_iter_interfaces(n, n_functions), template, output)
+
+        if outputs[0].getvalue() != outputs[1].getvalue():
+            raise SystemExit("stream_stubs doesn't match write_stubs.")
+
+        peaks = list[int]()
+
+        for write in (_write_all, _stream):
+            with open(os.devnull, "w") as devnull:
+                tracemalloc.start()
+                write(_iter_interfaces(n, n_functions), template, devnull)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+        print(f"{n:>8} {peaks[0] / 2**20:>18.1f} {peaks[1] / 2**20:>19.1f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Time merging the template files against reading the merged template back from the cache.
+
+Run with `python -m benchmarks.bench_template`.
+Both `--template` and a full generation start from `get_template`, so the difference is saved on every run.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+from unittest.mock import patch
+
+from vsstubs.template import _merge_template, get_template
+from vsstubs.utils import _get_cache_dir
+
+
+def _cached_template() -> str:
+    # Drop the in-memory copy to measure what a new process pays
+    get_template.cache_clear()
+    return get_template()
+
+
+def main(number: int = 20, repeat: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir, patch.dict(os.environ, VSSTUBS_CACHE_DIR=cache_dir):
+        _get_cache_dir.cache_clear()
+        _cached_template()
+
+        merge = min(timeit.repeat(_merge_template, number=number, repeat=repeat)) / number
+        cached = min(timeit.repeat(_cached_template, number=number, repeat=repeat)) / number
+
+    _get_cache_dir.cache_clear()
+    get_template.cache_clear()
+
+    print(f"{'merge (ms)':>11} {'cached (ms)':>12} {'speedup':>8}", file=sys.stderr)
+    print(f"{merge * 1e3:>11.3f} {cached * 1e3:>12.3f} {merge / cached:>7.1f}x", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
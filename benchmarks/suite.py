@@ -0,0 +1,178 @@
+"""
+Time each stage of the generation pipeline on synthetic plugins and compare the timings with the stored baselines.
+
+Run with `python -m benchmarks.suite [scale ...]`, running every scale of `SCALES` by default.
+Exits with 1 when a stage is slower than its baseline by more than `--threshold` times,
+and `--save` stores the timings as the new baselines in `baselines.json` instead.
+Without baselines for a scale, the run fails unless `--save` is given.
+
+The baselines are stored relative to a reference workload timed in the same run,
+which doesn't run any vsstubs code, so they can be compared across machines.
+
+No plugin is loaded, the plugin interfaces are built from VapourSynth's types.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from vsstubs.document import get_implementations_from_input, parse_stub
+from vsstubs.stubs import (
+    _format_annotation,
+    construct_implementations,
+    write_implementations,
+    write_plugins_bound,
+    write_stubs,
+)
+from vsstubs.template import _merge_template, get_template
+from vsstubs.types import Implementation, PluginInterface, parse_type
+from vsstubs.utils import _get_cache_dir
+
+from .synthetic import Scale, make_interfaces
+
+SCALES = {
+    "small": Scale(plugins=10, functions=10, params=6, union_depth=3, sequence_depth=1, callbacks=1),
+    "medium": Scale(plugins=100, functions=20, params=8, union_depth=4, sequence_depth=2, callbacks=1),
+    "large": Scale(plugins=200, functions=40, params=8, union_depth=6, sequence_depth=3, callbacks=2),
+    "wide": Scale(plugins=20, functions=20, params=40, union_depth=12, sequence_depth=3, callbacks=4),
+}
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+# Differences below this are timing noise, whatever the ratio.
+_MIN_REGRESSION = 1e-3
+
+
+def _reference() -> None:
+    # Plain Python string building like the stages do, to time how fast the machine runs them.
+    ", ".join([f"param{i % 50}: _IntLike | None = None" for i in range(100_000)])
+
+
+def _get_template() -> str:
+    # Drop the in-memory copy to measure what a new process pays
+    get_template.cache_clear()
+    return get_template()
+
+
+def _construct(interfaces: list[PluginInterface]) -> list[Implementation]:
+    # Each run starts from empty caches, like a new process would.
+    parse_type.cache_clear()
+    _format_annotation.cache_clear()
+    return construct_implementations(interfaces, compat=False)
+
+
+def _parse(text: str) -> list[Implementation]:
+    parse_stub.cache_clear()
+    return get_implementations_from_input(text)
+
+
+def time_stages(scale: Scale, repeat: int = 3) -> dict[str, float]:
+    """Return the best time in seconds of each stage of the pipeline for `scale`."""
+    interfaces = make_interfaces(scale)
+    template = get_template()
+    implementations = _construct(interfaces)
+    text = write_stubs(implementations, template)
+
+    if _parse(text) != implementations:
+        raise SystemExit("The implementations parsed back from the stubs don't match.")
+
+    stages: dict[str, Callable[[], Any]] = {
+        "merge_template": _merge_template,
+        "get_template": _get_template,
+        "construct_implementation": partial(_construct, interfaces),
+        "write_implementations": partial(write_implementations, implementations, template),
+        "write_plugins_bound": partial(write_plugins_bound, implementations, template),
+        "write_stubs": partial(write_stubs, implementations, template),
+        "get_implementations_from_input": partial(_parse, text),
+    }
+
+    return {name: min(timeit.repeat(stage, number=1, repeat=repeat)) for name, stage in stages.items()}
+
+
+def compare(timings: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Return the stages slower than their baseline by more than `threshold` times, both in seconds."""
+    return [
+        name
+        for name, seconds in timings.items()
+        if name in baseline and seconds > baseline[name] * threshold and seconds - baseline[name] > _MIN_REGRESSION
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scales", nargs="*", default=list(SCALES), metavar="scale", help=f"One of {', '.join(SCALES)}.")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Slowdown ratio failing a stage.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each stage, the best one is kept.")
+    parser.add_argument("--save", action="store_true", help="Store the timings as the new baselines.")
+    args = parser.parse_args(argv)
+
+    if unknown := set(args.scales) - SCALES.keys():
+        parser.error(f"unknown scales: {', '.join(sorted(unknown))}")
+
+    baselines: dict[str, Any] = json.loads(BASELINES.read_text("utf-8")) if BASELINES.exists() else {}
+    regressions, missing = list[str](), list[str]()
+
+    print(f"{'scale':>7} {'stage':>31} {'baseline (ms)':>14} {'time (ms)':>10} {'ratio':>6}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as cache_dir, patch.dict(os.environ, VSSTUBS_CACHE_DIR=cache_dir):
+        _get_cache_dir.cache_clear()
+        get_template.cache_clear()
+
+        for name in args.scales:
+            scale = SCALES[name]
+            # Timed along with the stages, so both run in the same conditions.
+            reference = min(timeit.repeat(_reference, number=1, repeat=max(args.repeat, 5)))
+            timings = time_stages(scale, args.repeat)
+
+            # A baseline recorded for another scale isn't comparable.
+            entry = baselines.get(name, {})
+            relative = entry.get("relative", {}) if entry.get("scale") == scale._asdict() else {}
+            # The time the baseline stands for on this machine
+            baseline = {stage: ratio * reference for stage, ratio in relative.items()}
+
+            if not baseline:
+                missing.append(name)
+
+            for stage, seconds in timings.items():
+                base, ratio = (
+                    (f"{baseline[stage] * 1e3:.2f}", f"{seconds / baseline[stage]:.2f}")
+                    if stage in baseline
+                    else ("-", "-")
+                )
+                print(f"{name:>7} {stage:>31} {base:>14} {seconds * 1e3:>10.2f} {ratio:>6}", file=sys.stderr)
+
+            regressions.extend(f"{name}/{stage}" for stage in compare(timings, baseline, args.threshold))
+            baselines[name] = {
+                "scale": scale._asdict(),
+                "relative": {stage: round(seconds / reference, 6) for stage, seconds in timings.items()},
+            }
+
+    _get_cache_dir.cache_clear()
+    get_template.cache_clear()
+
+    if args.save:
+        BASELINES.write_text(json.dumps(baselines, indent=2) + "\n", "utf-8")
+        print(f"Baselines saved to {BASELINES}", file=sys.stderr)
+        return 0
+
+    if missing:
+        print(f"No baseline for {', '.join(missing)}, record them with --save.", file=sys.stderr)
+        return 1
+
+    if regressions:
+        print(f"Regressed beyond {args.threshold}x: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
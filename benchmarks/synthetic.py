@@ -0,0 +1,158 @@
+"""Synthetic plugin implementations and stub texts for benchmarks."""
+
+from collections.abc import Callable, Sequence
+from inspect import Parameter, Signature
+from typing import Any, NamedTuple, Union
+
+from vsstubs.constants import _CORE_IMPL_END, _CORE_IMPL_START, _PLUGINS_IMPL_END, _PLUGINS_IMPL_START
+from vsstubs.types import Attribute, FunctionInterface, Implementation, PluginInterface, WrappedFunction
+
+_CORE_NAMES = ("Core", "VideoNode", "AudioNode")
+
+
+def make_implementations(n_plugins: int, n_functions: int = 10, n_params: int = 6) -> list[Implementation]:
+    """Build `n_plugins` implementations bound to `Core` and `VideoNode`."""
+    params = ", ".join(f"param{i}: _IntLike | _SequenceLike[_IntLike] | None = None" for i in range(n_params))
+
+    return [
+        Implementation(
+            f"plugin{p:05}",
+            {
+                core_name: [
+                    WrappedFunction(f"Function{f}(self, /, clip: VideoNode, {params}) -> VideoNode: ...")
+                    for f in range(n_functions)
+                ]
+                for core_name in _CORE_NAMES[:2]
+            },
+            f"Synthetic plugin number {p}",
+            [],
+        )
+        for p in range(n_plugins)
+    ]
+
+
+def make_stub_text(implementations: list[Implementation]) -> str:
+    """Render a stub text with the bound blocks of every core and the implementations block."""
+    parts = list[str]()
+
+    for core_name in _CORE_NAMES:
+        parts.append(f"class {core_name}:\n    def __repr__(self) -> str: ...\n\n")
+        parts.append(_CORE_IMPL_START.format(core_name=core_name) + "\n")
+        parts.extend(
+            Attribute(impl.namespace, core_name, impl.description).as_stub()
+            for impl in implementations
+            if core_name in impl.functions
+        )
+        parts.append(_CORE_IMPL_END.format(core_name=core_name) + "\n\n")
+
+    parts.append(_PLUGINS_IMPL_START + "\n")
+    parts.append("\n".join(impl.as_stub() for impl in implementations))
+    parts.append(_PLUGINS_IMPL_END + "\n")
+
+    return "".join(parts)
+
+
+def make_interface(n_functions: int, namespace: str = "synthetic") -> PluginInterface:
+    """
+    Build an interface of `n_functions` functions bound to `VideoNode`.
+
+    The parameters are annotated like the signatures VapourSynth reports for its plugins.
+    """
+    from vapoursynth import Func, VideoNode
+
+    annotations: list[Any] = [
+        Union[int, Sequence[int], None],  # noqa: UP007
+        Union[float, None],  # noqa: UP007
+        Union[str, bytes, bytearray, None],  # noqa: UP007
+        Union[Func, Callable[..., Any], None],  # noqa: UP007
+        Union[VideoNode, Sequence[VideoNode], None],  # noqa: UP007
+        Union[int, None],  # noqa: UP007
+    ]
+
+    functions = [
+        FunctionInterface(
+            f"Function{f}",
+            Signature(
+                [
+                    Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode),
+                    *(
+                        Parameter(f"param{i}", Parameter.POSITIONAL_OR_KEYWORD, annotation=annotation, default=None)
+                        for i, annotation in enumerate(annotations)
+                    ),
+                ],
+                return_annotation=VideoNode,
+            ),
+        )
+        for f in range(n_functions)
+    ]
+
+    return PluginInterface(namespace, {"VideoNode": functions}, "Synthetic plugin")
+
+
+class Scale(NamedTuple):
+    """Size and shape of a synthetic set of plugins."""
+
+    plugins: int
+    functions: int
+    """Functions per plugin."""
+    params: int
+    """Parameters per function, besides `clip`."""
+    union_depth: int
+    """Members of the union annotating each parameter, besides `None`."""
+    sequence_depth: int
+    """Maximum nesting of `Sequence` in the union members."""
+    callbacks: int
+    """Parameters per function annotated as callbacks, taken from `params`."""
+
+
+def make_annotation(union_depth: int, sequence_depth: int) -> Any:
+    """
+    Build a parameter annotation like VapourSynth reports, a union of `union_depth` types and `None`.
+
+    The member `i` is nested in `i % (sequence_depth + 1)` sequences.
+    """
+    from vapoursynth import AudioNode, VideoNode
+
+    member_types = (int, float, VideoNode, AudioNode, str)
+    members = list[Any]()
+
+    for i in range(union_depth):
+        member = member_types[i % len(member_types)]
+
+        for _ in range(i % (sequence_depth + 1)):
+            member = Sequence[member]
+
+        members.append(member)
+
+    return Union[(*members, None)]
+
+
+def make_interfaces(scale: Scale) -> list[PluginInterface]:
+    """Build `scale.plugins` interfaces whose functions are bound to `VideoNode`."""
+    from vapoursynth import Func, VideoNode
+
+    callback = Union[Func, Callable[..., Any], None]  # noqa: UP007
+    annotations = [
+        callback if i < scale.callbacks else make_annotation(scale.union_depth, scale.sequence_depth)
+        for i in range(scale.params)
+    ]
+
+    signature = Signature(
+        [
+            Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode),
+            *(
+                Parameter(f"param{i}", Parameter.POSITIONAL_OR_KEYWORD, annotation=annotation, default=None)
+                for i, annotation in enumerate(annotations)
+            ),
+        ],
+        return_annotation=VideoNode,
+    )
+
+    return [
+        PluginInterface(
+            f"plugin{p:05}",
+            {"VideoNode": [FunctionInterface(f"Function{f}", signature) for f in range(scale.functions)]},
+            f"Synthetic plugin number {p}",
+        )
+        for p in range(scale.plugins)
+    ]
@@ -1,5 +1,7 @@
 """Typing stubs for VapourSynth."""
 
+from .context import GenerationContext
 from .func import output_stubs
+from .profiling import profiling
 
-__all__ = ["output_stubs"]
+__all__ = ["GenerationContext", "output_stubs", "profiling"]
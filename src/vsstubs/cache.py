@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .types import PluginInterface
+from .utils import _get_cache_dir, _get_vsstubs_version, _write_text_atomic
+
+if TYPE_CHECKING:
+    from vapoursynth import Plugin
+
+log = getLogger(__name__)
+
+_SIGNATURES_DIR = "signatures"
+# Size, modification time and sha256 of each library file hashed for `get_library_key`
+_LIBRARY_DIGESTS = "libraries.json"
+
+_digests: dict[str, list[Any]] | None = None
+_LOCK_DIGESTS = threading.Lock()
+
+
+def get_plugin_key(plugin: Plugin) -> str:
+    """
+    Fingerprint a loaded plugin from its library file.
+
+    The key changes whenever the library is replaced, the VapourSynth API changes or vsstubs is upgraded.
+    """
+    from vapoursynth import __api_version__
+
+    try:
+        st = os.stat(plugin.plugin_path)
+    except (OSError, ValueError):
+        # Built-in plugins may not report a usable library path.
+        size, mtime = 0, 0
+    else:
+        size, mtime = st.st_size, st.st_mtime_ns
+
+    fields: list[Any] = [
+        plugin.namespace,
+        plugin.identifier,
+        plugin.plugin_path,
+        size,
+        mtime,
+        str(__api_version__),
+        _get_vsstubs_version(),
+    ]
+
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+
+def get_library_key(plugin: Plugin) -> str:
+    """
+    Short key of the library file of a loaded plugin, written in the implementation markers of the stubs.
+
+    Unlike `get_plugin_key`, it's derived from the size and content of the library only,
+    so the same build installed anywhere, at any time, gives the same stubs.
+    """
+    fields = [plugin.namespace, plugin.identifier, *_get_library_digest(plugin.plugin_path)]
+
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()[:16]
+
+
+def _get_library_digest(path: str) -> tuple[int, str]:
+    """
+    Size and sha256 of a library file.
+
+    The digests are kept in the cache directory with the size and modification time of their file,
+    so a library is only read again once it changed.
+    """
+    global _digests
+
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        # Built-in plugins may not report a usable library path.
+        return 0, ""
+
+    digests_path = _get_cache_dir() / _LIBRARY_DIGESTS
+
+    with _LOCK_DIGESTS:
+        if _digests is None:
+            try:
+                _digests = dict(json.loads(digests_path.read_text()))
+            except (OSError, TypeError, ValueError):
+                _digests = {}
+
+        digests = _digests
+
+        if (entry := digests.get(path)) is not None and entry[:2] == [st.st_size, st.st_mtime_ns]:
+            return st.st_size, entry[2]
+
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return st.st_size, ""
+
+    with _LOCK_DIGESTS:
+        digests[path] = [st.st_size, st.st_mtime_ns, digest]
+
+        try:
+            digests_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_text_atomic(digests_path, json.dumps(digests))
+        except OSError:
+            log.debug("Couldn't write %s", digests_path, exc_info=True)
+
+    return st.st_size, digest
+
+
+def _entry_path(cache_dir: Path, namespace: str) -> Path:
+    return cache_dir / _SIGNATURES_DIR / f"{namespace}.json"
+
+
+def read_cached_plugin(cache_dir: Path, namespace: str, key: str) -> PluginInterface | None:
+    """Return the cached interface of a plugin if its entry matches `key`."""
+    try:
+        entry = json.loads(_entry_path(cache_dir, namespace).read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        log.debug("Ignoring unreadable cache entry for '%s'", namespace, exc_info=True)
+        return None
+
+    if entry.get("key") != key:
+        return None
+
+    try:
+        return PluginInterface.from_dict(entry["plugin"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        log.debug("Ignoring invalid cache entry for '%s'", namespace, exc_info=True)
+        return None
+
+
+def write_cached_plugin(cache_dir: Path, key: str, pinter: PluginInterface) -> None:
+    """Store the interface of a plugin, replacing any previous entry for its namespace."""
+    try:
+        data = json.dumps({"key": key, "plugin": pinter.as_dict()})
+    except TypeError:
+        log.debug("Plugin '%s' can't be cached", pinter.namespace, exc_info=True)
+        return
+
+    path = _entry_path(cache_dir, pinter.namespace)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_text_atomic(path, data)
+    except OSError:
+        log.warning("Couldn't write the cache entry %s", path, exc_info=True)
@@ -5,7 +5,7 @@ import sys
 from dataclasses import dataclass
 from logging import DEBUG, basicConfig, getLogger
 from pathlib import Path
-from typing import IO, Annotated
+from typing import IO, Annotated, Any
 
 from cyclopts import App, Group, Parameter
 from cyclopts.help import HelpPanel
@@ -14,12 +14,17 @@ from rich.console import Console, ConsoleOptions
 from rich.logging import RichHandler
 from rich.pretty import pretty_repr
 
-from .func import check_stubs, console, list_plugins, output_stubs
+from .constants import DEFAULT_PLUGIN_TIMEOUT
+from .context import GenerationContext
+from .func import check_stubs, list_plugins, output_stubs, snapshot_plugins
+from .profiling import start_profiling, stop_profiling
 from .utils import _get_default_stubs_path
 
 __all__ = ["AppConfig", "app", "main"]
 
-log = getLogger(__name__)
+log, console = getLogger(__name__), Console(stderr=True)
+# The runs of the command line print to the console of the app.
+_context = GenerationContext(console)
 io_group = Group("I/O", sort_key=0)
 others_group = Group("Others", sort_key=1)
 commands_group = Group("Commands", sort_key=2)
@@ -60,12 +65,34 @@ class AppConfig:
     The wheel path is printed to stdout so it can be passed to pip."""
     load: Annotated[list[Path] | None, Parameter(alias="-L", negative_iterable="", group=io_group)] = None
     """Load plugins from a folder or a single library file."""
+    from_snapshot: Annotated[Path | None, Parameter(group=io_group)] = None
+    """Read the plugin signatures from a snapshot written by the snapshot command instead of loading the plugins."""
     template: Annotated[bool, Parameter(alias="-T", negative=False, group=others_group)] = False
     """Export blank template; excludes existing plugins unless --load or --add is used."""
     compat: Annotated[bool, Parameter(negative=False, group=others_group)] = False
     """Enable return type compatibility for APIv3 plugins."""
+    cache: Annotated[bool, Parameter(negative=False, group=others_group)] = False
+    """Cache plugin signatures on disk and reuse them while the plugin libraries are unchanged.
+    The cache lives in the user cache folder unless VSSTUBS_CACHE_DIR is set."""
+    workers: Annotated[int | None, Parameter(group=others_group)] = None
+    """Introspect the plugins in this many isolated processes, each loading one plugin at a time.
+    A plugin that crashes or hangs is reported and skipped instead of stopping the run."""
+    plugin_timeout: Annotated[float, Parameter(group=others_group)] = DEFAULT_PLUGIN_TIMEOUT
+    """Seconds allowed to load and introspect a single plugin with --workers."""
+    jobs: Annotated[int | None, Parameter(alias="-j", group=others_group)] = None
+    """Render the plugin stubs in this many processes once the plugins are introspected."""
+    stream: Annotated[bool, Parameter(negative=False, group=others_group)] = False
+    """Write each plugin stub as soon as its plugin is introspected to keep the memory usage low.
+    Only for a full generation."""
+    no_autoload: Annotated[bool, Parameter(negative=False, group=others_group)] = False
+    """Don't autoload the installed plugins, only introspect the built-in ones and those from --load.
+    With update, the plugins that aren't loaded are kept as they are."""
     quiet: Annotated[bool, Parameter(group=others_group, negative=False)] = False
     """Suppress message output."""
+    profile: Annotated[bool, Parameter(negative=False, group=others_group)] = False
+    """Print on stderr a JSON report of the time spent in each phase and on each plugin, with the cache hit ratios."""
+    profile_file: Annotated[Path | None, Parameter(group=others_group)] = None
+    """Write the --profile report to this file instead of stderr."""
     debug: Annotated[bool, Parameter(show=False)] = False
 
     def process(self, command_name: str | None = None) -> tuple[IO[str] | str | None, Path | IO[str] | str | None]:
@@ -83,6 +110,11 @@ class AppConfig:
         if self.debug:
             basicConfig(level=DEBUG, handlers=[RichHandler(level=DEBUG, console=Console(stderr=True))])
 
+        if self.profile or self.profile_file is not None:
+            global _profile_file
+            _profile_file = self.profile_file
+            start_profiling()
+
         input_val = self.input
         if command_name in ["check", "update"] and input_val is None:
             default_path = _get_default_stubs_path()
@@ -117,25 +149,61 @@ class AppConfig:
 
 DEFAULT_CONFIG = AppConfig()
 _active_config = DEFAULT_CONFIG
+_profile_file: Path | None = None
 
 
 def _get_effective_config(cmd_config: AppConfig) -> AppConfig:
     return cmd_config if cmd_config != DEFAULT_CONFIG else _active_config
 
 
-@app.command
-def add(plugins: list[str], /, config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG) -> None:
+def _write_profile() -> None:
+    if (profiler := stop_profiling()) is None:
+        return
+
+    report = json.dumps(profiler.report(), indent=2)
+
+    if _profile_file is None:
+        print(report, file=sys.stderr)
+    else:
+        _profile_file.write_text(report + "\n")
+
+
+def _output_stubs(output_json: bool, **kwargs: Any) -> None:
+    if not output_json:
+        output_stubs(**kwargs, context=_context)
+        return
+
+    if kwargs["output"] is sys.stdout:
+        console.print("[red]Error: Cannot use '-' as output when '--json' is enabled.[/red]")
+        raise SystemExit(1)
+
+    # Keep stdout for the JSON result only, e.g. without the wheel path.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        out = output_stubs(**kwargs, context=_context)
+
+    json.dump(out, sys.stdout)
+
+
+@app.command(help_formatter=CleanHelpFormatter())
+def add(
+    plugins: list[str],
+    /,
+    config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG,
+    output_json: Annotated[bool, Parameter(name="json", group=io_group, negative=False)] = False,
+) -> None:
     """Add or update the specified plugins in the stubs.
 
     Args:
         plugins: Plugins to add or update.
+        output_json: Print to stdout a JSON-parseable object with the output path and whether it was written.
     """
     cfg = _get_effective_config(config)
     input_file, output_file = cfg.process("add")
 
     console.print(f"Adding plugins: {', '.join(plugins)}")
 
-    output_stubs(
+    _output_stubs(
+        output_json,
         input_file=input_file,
         output=output_file,
         wheel=cfg.wheel,
@@ -145,23 +213,37 @@ def add(plugins: list[str], /, config: Annotated[AppConfig, Parameter(show=False
         add=set(plugins),
         remove=None,
         compat=cfg.compat,
+        cache=cfg.cache,
+        workers=cfg.workers,
+        plugin_timeout=cfg.plugin_timeout,
+        jobs=cfg.jobs,
+        autoload=not cfg.no_autoload,
+        from_snapshot=cfg.from_snapshot,
+        stream=cfg.stream,
     )
     raise SystemExit(0)
 
 
-@app.command
-def remove(plugins: list[str], /, config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG) -> None:
+@app.command(help_formatter=CleanHelpFormatter())
+def remove(
+    plugins: list[str],
+    /,
+    config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG,
+    output_json: Annotated[bool, Parameter(name="json", group=io_group, negative=False)] = False,
+) -> None:
     """Remove the specified plugins from the stubs.
 
     Args:
         plugins: Plugins to remove.
+        output_json: Print to stdout a JSON-parseable object with the output path and whether it was written.
     """
     cfg = _get_effective_config(config)
     input_file, output_file = cfg.process("remove")
 
     console.print(f"Removing plugins: {', '.join(plugins)}")
 
-    output_stubs(
+    _output_stubs(
+        output_json,
         input_file=input_file,
         output=output_file,
         wheel=cfg.wheel,
@@ -171,6 +253,13 @@ def remove(plugins: list[str], /, config: Annotated[AppConfig, Parameter(show=Fa
         add=None,
         remove=set(plugins),
         compat=cfg.compat,
+        cache=cfg.cache,
+        workers=cfg.workers,
+        plugin_timeout=cfg.plugin_timeout,
+        jobs=cfg.jobs,
+        autoload=not cfg.no_autoload,
+        from_snapshot=cfg.from_snapshot,
+        stream=cfg.stream,
     )
     raise SystemExit(0)
 
@@ -178,12 +267,18 @@ def remove(plugins: list[str], /, config: Annotated[AppConfig, Parameter(show=Fa
 @app.command(help_formatter=CleanHelpFormatter())
 def check(
     config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG,
+    fast: Annotated[bool, Parameter(negative=False, group=others_group)] = False,
+    exit_code: Annotated[bool, Parameter(negative=False, group=others_group)] = False,
     output_json: Annotated[bool, Parameter(name="json", group=io_group, negative=False)] = False,
 ) -> None:
     """Check for new plugins or new plugin signatures.
 
     Args:
-        output_json: Print to stdout a json parseable string of the checked old and new plugins.
+        fast: Only compare the plugin library files with the keys written in the stubs,
+            without introspecting the plugins.
+        exit_code: Stop at the first difference and exit with 1 if the stubs are outdated, 0 otherwise.
+        output_json: Print to stdout a json parseable string of the checked old, new and modified plugins,
+            with the added, removed and changed functions of each modified plugin.
     """
     cfg = _get_effective_config(config)
     input_file, _ = cfg.process("check")
@@ -195,23 +290,45 @@ def check(
         raise SystemExit(1)
 
     with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
-        out = check_stubs(input_file)
+        out = check_stubs(
+            input_file,
+            cache=cfg.cache,
+            workers=cfg.workers,
+            plugin_timeout=cfg.plugin_timeout,
+            jobs=cfg.jobs,
+            load=cfg.load,
+            autoload=not cfg.no_autoload,
+            from_snapshot=cfg.from_snapshot,
+            fast=fast,
+            stop_early=exit_code,
+            context=_context,
+        )
 
     if output_json:
         json.dump(out, sys.stdout)
 
-    raise SystemExit(0)
+    raise SystemExit(1 if exit_code and (out["old"] or out["new"] or out["modified"]) else 0)
 
 
-@app.command
-def update(config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG) -> None:
-    """Update the current signatures from the input."""
+@app.command(help_formatter=CleanHelpFormatter())
+def update(
+    config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG,
+    incremental: Annotated[bool, Parameter(negative=False, group=others_group)] = False,
+    output_json: Annotated[bool, Parameter(name="json", group=io_group, negative=False)] = False,
+) -> None:
+    """Update the current signatures from the input.
+
+    Args:
+        incremental: Only re-render the plugins whose signatures changed since the input was generated.
+        output_json: Print to stdout a JSON-parseable object with the output path and whether it was written.
+    """
     cfg = _get_effective_config(config)
     input_file, output_file = cfg.process("update")
 
     console.print("Updating stubs stubs...")
 
-    output_stubs(
+    _output_stubs(
+        output_json,
         input_file=input_file,
         output=output_file,
         wheel=cfg.wheel,
@@ -221,6 +338,14 @@ def update(config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG)
         add=None,
         remove=None,
         compat=cfg.compat,
+        cache=cfg.cache,
+        workers=cfg.workers,
+        plugin_timeout=cfg.plugin_timeout,
+        jobs=cfg.jobs,
+        autoload=not cfg.no_autoload,
+        from_snapshot=cfg.from_snapshot,
+        stream=cfg.stream,
+        incremental=incremental,
     )
     raise SystemExit(0)
 
@@ -238,7 +363,16 @@ def plugins(
     cfg = _get_effective_config(config)
     input_file, _ = cfg.process("plugins")
 
-    out = list_plugins(input_file=input_file, load=cfg.load)
+    out = list_plugins(
+        input_file=input_file,
+        load=cfg.load,
+        cache=cfg.cache,
+        workers=cfg.workers,
+        plugin_timeout=cfg.plugin_timeout,
+        autoload=not cfg.no_autoload,
+        from_snapshot=cfg.from_snapshot,
+        context=_context,
+    )
 
     if output_json:
         json.dump(out, sys.stdout)
@@ -248,6 +382,47 @@ def plugins(
     raise SystemExit(0)
 
 
+@app.command
+def snapshot(config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG) -> None:
+    """Dump the signatures of the plugins into a JSON snapshot, written to stdout unless --output is given.
+
+    The stubs can then be generated with --from-snapshot on a machine without the plugins.
+    """
+    cfg = _get_effective_config(config)
+
+    if cfg.output == "@":
+        console.print("[red]Error: Cannot use '@' as output for a snapshot.[/red]")
+        raise SystemExit(1)
+
+    cfg.process("snapshot")
+
+    snapshot_plugins(
+        sys.stdout if cfg.output in (None, "-") else Path(cfg.output),
+        load=cfg.load,
+        cache=cfg.cache,
+        workers=cfg.workers,
+        plugin_timeout=cfg.plugin_timeout,
+        autoload=not cfg.no_autoload,
+        context=_context,
+    )
+    raise SystemExit(0)
+
+
+@app.command
+def serve(config: Annotated[AppConfig, Parameter(show=False)] = DEFAULT_CONFIG) -> None:
+    """Serve check, plugins, add, remove and update requests as newline-delimited JSON-RPC over stdin/stdout.
+
+    The VapourSynth core and the introspected plugins are kept in memory between requests.
+    """
+    from .server import serve as serve_requests
+
+    cfg = _get_effective_config(config)
+    cfg.process("serve")
+
+    serve_requests(context=_context)
+    raise SystemExit(0)
+
+
 @app.meta.default
 def cli_main(
     *tokens: Annotated[str, Parameter(show=False, allow_leading_hyphen=True)],
@@ -257,20 +432,31 @@ def cli_main(
     global _active_config
     _active_config = config
 
-    if tokens:
-        app(tokens)
-    else:
-        input_file, output_file = config.process()
-        output_stubs(
-            input_file,
-            output_file,
-            config.wheel,
-            config.template,
-            config.load,
-            False,
-            compat=config.compat,
-        )
-        raise SystemExit(0)
+    try:
+        if tokens:
+            app(tokens)
+        else:
+            input_file, output_file = config.process()
+            output_stubs(
+                input_file,
+                output_file,
+                config.wheel,
+                config.template,
+                config.load,
+                False,
+                compat=config.compat,
+                cache=config.cache,
+                workers=config.workers,
+                plugin_timeout=config.plugin_timeout,
+                jobs=config.jobs,
+                autoload=not config.no_autoload,
+                from_snapshot=config.from_snapshot,
+                stream=config.stream,
+                context=_context,
+            )
+            raise SystemExit(0)
+    finally:
+        _write_profile()
 
 
 def main() -> None:
@@ -6,8 +6,15 @@ _ATTR_IMPL_END = "# </attribute/{core_name}_bound/{name}>"
 _PLUGINS_IMPL_START = "# <plugins/implementations>"
 _PLUGINS_IMPL_END = "# </plugins/implementations>"
 _IMPL_START = "# <implementation/{name}>"
+_IMPL_START_ATTRIBUTES = "# <implementation/{name} {attributes}>"
 _IMPL_END = "# </implementation/{name}>"
 
+# Class names of the core-likes plugins can be bound to, see `GenerationContext.cores`
+_CORE_NAMES = ("Core", "VideoNode", "AudioNode")
+
+# Seconds allowed to load and introspect a single library file in a worker process
+DEFAULT_PLUGIN_TIMEOUT = 60.0
+
 _VSCALLBACK_SIGNATURE = "_VSCallback_{plugin}_{func}_{param}"
 
 _callback_signatures = {
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable, Sequence
+from functools import wraps
+from inspect import signature
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+from weakref import WeakSet
+
+from rich.console import Console
+
+from .profiling import phase, record_cache
+from .utils import running_via_cli
+
+if TYPE_CHECKING:
+    from vapoursynth import Core, Plugin
+
+    from .types import PluginInterface, _CoreLike
+    from .workers import IntrospectionResult
+
+__all__ = ["GenerationContext", "get_default_context", "shares_core"]
+
+# Every live context, to drop what they introspected from a core that changed or was destroyed.
+_CONTEXTS = WeakSet["GenerationContext"]()
+_LOCK_CONTEXTS = threading.Lock()
+_REGISTERED = False
+
+_DEFAULT_CONTEXT: GenerationContext | None = None
+_LOCK_DEFAULT = threading.Lock()
+
+# The plugin paths loaded by the runs in progress in the core of the process, see `shares_core`.
+_RUNNING_LOADS = Counter[frozenset[str]]()
+_LOCK_RUNNING = threading.Lock()
+
+
+class GenerationContext:
+    """
+    The console of the stub generation runs and what they introspected from the VapourSynth core.
+
+    The plugins, the namespaces bound to each core-like and the plugin interfaces are introspected once per context
+    and kept until plugins are loaded in the core or the core is destroyed.
+    A context can be shared by runs in different threads, and runs given different contexts print to their own console.
+
+    Every context introspects the same core, the one of the process.
+    The plugins loaded with `load` stay loaded for every later run and every context,
+    and the runs in progress at the same time must load the same plugins, see `shares_core`.
+    Only the worker processes of `workers`, also used by the runs with `autoload=False`, get cores of their own.
+
+    Example:
+        ```python
+        from concurrent.futures import ThreadPoolExecutor
+
+        from rich.console import Console
+
+        from vsstubs import GenerationContext
+        from vsstubs.func import check_stubs
+
+        context = GenerationContext(Console(quiet=True))
+
+        # Both checks compare the stubs with the same plugins
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(lambda path: check_stubs(path, context=context), ["a.pyi", "b.pyi"]))
+        ```
+    """
+
+    def __init__(self, console: Console | None = None) -> None:
+        """
+        Args:
+            console: Where the progress and the warnings are printed.
+                Defaults to stderr, quiet unless vsstubs runs from the command line.
+        """
+        self.console = console if console is not None else Console(stderr=True, quiet=not running_via_cli())
+
+        self._lock = threading.RLock()
+        self._core: Core | None = None
+        self._plugins: Sequence[Plugin] | None = None
+        self._dirs = dict[Any, list[str]]()
+        self._cores: Sequence[_CoreLike] | None = None
+        self._plugin_interfaces: dict[Path | None, Sequence[PluginInterface]] = {}
+        self._isolated: dict[tuple[tuple[str, ...], int, float, bool], IntrospectionResult] = {}
+
+        with _LOCK_CONTEXTS:
+            _CONTEXTS.add(self)
+
+    @property
+    def core(self) -> Core:
+        """The VapourSynth core of the process, the current one when it's first used."""
+        with self._lock:
+            if self._core is None:
+                from vapoursynth import core
+
+                _register_destroy_cb()
+                self._core = core.core
+
+            return self._core
+
+    def plugins(self) -> Sequence[Plugin]:
+        """The plugins loaded in the core."""
+        with self._lock:
+            if not (hit := self._plugins is not None):
+                self._plugins = tuple(self.core.plugins())
+
+            record_cache("GenerationContext.plugins", hit, 1)
+
+            return self._plugins
+
+    def dir(self, has_dir: Any) -> list[str]:
+        """The names `dir` lists for a core-like or a plugin."""
+        with self._lock:
+            if not (hit := has_dir in self._dirs):
+                self._dirs[has_dir] = dir(has_dir)
+
+            record_cache("GenerationContext.dir", hit, len(self._dirs))
+
+            return self._dirs[has_dir]
+
+    def cores(self) -> Sequence[_CoreLike]:
+        """The core-likes plugins can be bound to: the core, a video node and an audio node."""
+        from vapoursynth import GRAY8
+
+        with self._lock:
+            if self._cores is None:
+                core = self.core
+                self._cores = [
+                    core,
+                    core.std.BlankClip(None, 1, 1, GRAY8, 1, 1, 1, 0, True),
+                    core.std.BlankAudio(None, length=1, keep=True),
+                ]
+
+            return self._cores
+
+    def plugin_interfaces(self, cache_dir: Path | None = None) -> Sequence[PluginInterface]:
+        """The interfaces of the loaded plugins, see `stubs.retrieve_plugins`."""
+        from .stubs import retrieve_plugins
+
+        with self._lock:
+            # The signatures of a loaded plugin can't change for the lifetime of the core.
+            if (pinters := self._plugin_interfaces.get(cache_dir)) is None:
+                pinters = self._plugin_interfaces[cache_dir] = retrieve_plugins(self.cores(), cache_dir, context=self)
+
+            return pinters
+
+    def introspect_isolated(
+        self, load: tuple[str, ...], workers: int, plugin_timeout: float, autoload: bool
+    ) -> IntrospectionResult:
+        """Introspect the plugins in worker processes, see `workers.introspect_plugins`, once per set of arguments."""
+        from .workers import introspect_plugins
+
+        key = (load, workers, plugin_timeout, autoload)
+
+        with self._lock:
+            if (result := self._isolated.get(key)) is not None:
+                return result
+
+            self.console.print(f"Introspecting the plugins with {workers} worker(s)...")
+
+            with phase("introspect_workers"):
+                result = self._isolated[key] = introspect_plugins(
+                    load, autoload=autoload, jobs=workers, timeout=plugin_timeout
+                )
+
+            for library, reason in result.skipped.items():
+                self.console.print(f"[yellow]Skipped {library}: {reason}[/yellow]")
+
+            return result
+
+    def clear_plugins(self) -> None:
+        """Drop the plugins and their interfaces, e.g. once other plugins are loaded in the core."""
+        with self._lock:
+            self._plugins = None
+            self._dirs.clear()
+            self._plugin_interfaces.clear()
+
+    def clear(self) -> None:
+        """Drop everything introspected from the core and the core itself, so the current core is used next time."""
+        with self._lock:
+            self.clear_plugins()
+            self._cores = None
+            self._core = None
+
+
+def get_default_context() -> GenerationContext:
+    """The context used when none is given, kept for the lifetime of the process."""
+    global _DEFAULT_CONTEXT
+
+    with _LOCK_DEFAULT:
+        if _DEFAULT_CONTEXT is None:
+            _DEFAULT_CONTEXT = GenerationContext()
+
+        return _DEFAULT_CONTEXT
+
+
+def shares_core[F: Callable[..., Any]](func: F) -> F:
+    """
+    Reject a run of `func` loading other plugins than the runs in progress, as they all use the core of the process.
+
+    The plugins are taken from the `load` argument of `func`.
+    The runs introspecting the plugins with `workers` or without `autoload`, or reading them `from_snapshot`,
+    don't use the core.
+    """
+    params = signature(func)
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        arguments = params.bind(*args, **kwargs).arguments
+
+        if arguments.get("workers") or arguments.get("autoload") is False or arguments.get("from_snapshot"):
+            return func(*args, **kwargs)
+
+        load = frozenset(str(Path(path).resolve()) for path in arguments.get("load") or ())
+
+        with _LOCK_RUNNING:
+            if any(other != load for other in _RUNNING_LOADS):
+                raise ValueError(
+                    "Other plugins can't be loaded while another run uses the VapourSynth core, "
+                    "which every generation context shares."
+                )
+
+            _RUNNING_LOADS[load] += 1
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with _LOCK_RUNNING:
+                _RUNNING_LOADS[load] -= 1
+
+                # No run is compared with the finished ones.
+                if not _RUNNING_LOADS[load]:
+                    del _RUNNING_LOADS[load]
+
+    return cast(F, wrapper)
+
+
+def _clear_plugins(core: Core) -> None:
+    """Drop the plugins introspected by every context using `core`, once plugins are loaded in it."""
+    with _LOCK_CONTEXTS:
+        contexts = list(_CONTEXTS)
+
+    for context in contexts:
+        if context._core is core:
+            context.clear_plugins()
+
+
+def _clear_all() -> None:
+    with _LOCK_CONTEXTS:
+        contexts = list(_CONTEXTS)
+
+    for context in contexts:
+        context.clear()
+
+
+def _register_destroy_cb() -> None:
+    global _REGISTERED
+
+    with _LOCK_CONTEXTS:
+        if not _REGISTERED:
+            from vapoursynth import register_on_destroy
+
+            register_on_destroy(_clear_all)
+            _REGISTERED = True
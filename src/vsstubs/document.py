@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Mapping, Sequence
+from functools import cached_property, lru_cache
+from itertools import takewhile
+from typing import NamedTuple
+
+from .constants import _ATTR_IMPL_START, _CORE_IMPL_START, _PLUGINS_IMPL_START
+from .profiling import phase
+from .types import Implementation, WrappedFunction
+
+# Matches every `# <name key=value ...>` / `# </name>` marker line written by vsstubs.
+_MARKER_PATTERN = re.compile(r"^# <(/?)([^\s>]+)([^>\n]*)>[ \t]*$", re.MULTILINE)
+
+# Matches the class blocks like "_Core_bound", "_VideoNode_bound" or "_AudioNode_bound"
+_CORE_BOUND_PATTERN = re.compile(r"class _(\w+)_bound:")
+
+# Matches the end of a function definition
+_FUNC_END_PATTERN = re.compile(r"-> [\w\[\], |]+: \.\.\.")
+
+
+def _marker_name(marker: str) -> str:
+    """Turn a marker line such as `# <implementation/std>` into its name `implementation/std`."""
+    return marker.removeprefix("# <").removesuffix(">").split(maxsplit=1)[0]
+
+
+class MarkerBlock(NamedTuple):
+    """Offsets of a block delimited by an opening and a closing marker."""
+
+    name: str
+    start: int
+    """Offset of the opening marker."""
+    body_start: int
+    """Offset right after the opening marker line."""
+    body_end: int
+    """Offset of the closing marker."""
+    end: int
+    """Offset right after the closing marker."""
+    attributes: Mapping[str, str]
+    """The `key=value` pairs written after the name in the opening marker."""
+
+
+class MarkerIndex:
+    """
+    Index of every marker block of a stub text, built in a single pass.
+
+    Blocks are looked up by their opening marker as formatted from the `constants` templates,
+    e.g. `index.get(_IMPL_START.format(name="std"))`.
+    """
+
+    __slots__ = ("_blocks", "_children", "text")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._blocks = dict[str, MarkerBlock]()
+        self._children = dict[str, list[MarkerBlock]]()
+
+        # Opened blocks as (name, marker offset, body offset, attributes)
+        stack = list[tuple[str, int, int, str]]()
+        # Number of opened blocks of each name in the stack, to find stray closing markers without scanning it
+        opened_count = Counter[str]()
+
+        for m in _MARKER_PATTERN.finditer(text):
+            closing, name, attributes = m.groups()
+
+            if not closing:
+                stack.append((name, m.start(), m.end() + 1, attributes))
+                opened_count[name] += 1
+                continue
+
+            # Drop the blocks left unclosed, ignore the stray closing markers.
+            if not opened_count[name]:
+                continue
+
+            while (opened := stack.pop())[0] != name:
+                opened_count[opened[0]] -= 1
+
+            opened_count[name] -= 1
+
+            block = MarkerBlock(
+                name,
+                opened[1],
+                min(opened[2], m.start()),
+                m.start(),
+                m.end(),
+                {k: v for k, _, v in (attr.partition("=") for attr in opened[3].split())},
+            )
+            self._blocks[name] = block
+
+            if stack:
+                self._children.setdefault(stack[-1][0], []).append(block)
+
+    def __contains__(self, marker: str) -> bool:
+        return _marker_name(marker) in self._blocks
+
+    def get(self, marker: str) -> MarkerBlock | None:
+        """Get the block opened by `marker`."""
+        return self._blocks.get(_marker_name(marker))
+
+    def body(self, marker: str) -> str | None:
+        """Get the text between the opening and closing lines of the block opened by `marker`."""
+        if (block := self.get(marker)) is None:
+            return None
+
+        return self.text[block.body_start : block.body_end]
+
+    def children(self, marker: str) -> Iterator[MarkerBlock]:
+        """Iterate over the blocks directly nested in the block opened by `marker`, in order."""
+        yield from self._children.get(_marker_name(marker), ())
+
+
+class StubDocument:
+    """
+    A stub text and its marker index.
+
+    The plugin implementations are parsed once, on first access.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.index = MarkerIndex(text)
+
+    def core_bound(self, core_name: str) -> MarkerBlock | None:
+        """Get the `plugins/bound/{core_name}` block."""
+        return self.index.get(_CORE_IMPL_START.format(core_name=core_name))
+
+    def attribute(self, core_name: str, namespace: str) -> MarkerBlock | None:
+        """Get the attribute block of a plugin inside the `plugins/bound/{core_name}` block."""
+        core_bound = self.core_bound(core_name)
+        attr = self.index.get(_ATTR_IMPL_START.format(core_name=core_name, name=namespace))
+
+        if core_bound is None or attr is None or not core_bound.start < attr.start < core_bound.end:
+            return None
+
+        return attr
+
+    def description(self, core_name: str, namespace: str) -> str:
+        """Get the docstring of a plugin attribute."""
+        if self.core_bound(core_name) is None:
+            raise ValueError(f"No core implementation block found for {core_name}.")
+
+        if (attr := self.attribute(core_name, namespace)) is None:
+            raise ValueError(f"No attribute block found for {core_name}.{namespace}.")
+
+        attr_body = self.text[attr.body_start : attr.body_end]
+
+        doc_start, doc_end = attr_body.find('"""'), attr_body.rfind('"""')
+
+        return attr_body[doc_start + 3 : doc_end] if doc_start != doc_end else ""
+
+    def library_keys(self) -> dict[str, str | None]:
+        """The library key written in the opening marker of each implementation block, without parsing the blocks."""
+        return {
+            block.name.partition("/")[2]: block.attributes.get("library")
+            for block in self.index.children(_PLUGINS_IMPL_START)
+        }
+
+    @cached_property
+    def implementations(self) -> Sequence[Implementation]:
+        """The plugin implementations of the `plugins/implementations` block, in order."""
+        implementations = list[Implementation]()
+
+        for block in self.index.children(_PLUGINS_IMPL_START):
+            name = block.name.partition("/")[2]
+            body = self.text[block.body_start : block.body_end]
+
+            if not body:
+                raise ValueError(f"No plugin implementation block found for {name}.")
+
+            extras, functions = _parse_implementation_body(body)
+
+            doc = self.description(next(iter(functions)), name)
+
+            implementations.append(
+                Implementation(
+                    name, functions, doc, extras, block.attributes.get("fingerprint"), block.attributes.get("library")
+                )
+            )
+
+        return tuple(implementations)
+
+
+@lru_cache(maxsize=16)
+def parse_stub(text: str) -> StubDocument:
+    """
+    Parse a stub text.
+
+    The last parsed documents are kept in a bounded LRU cache, see `parse_stub.cache_info()`.
+    """
+    return StubDocument(text)
+
+
+def get_implementations_from_input(text: str) -> list[Implementation]:
+    """Parse a file to extract plugin implementations."""
+    with phase("parse_input"):
+        return list(parse_stub(text).implementations)
+
+
+def _parse_implementation_body(body: str) -> tuple[list[str], dict[str, list[WrappedFunction]]]:
+    """Extract the extra types and the functions of each core-like from an implementation block in one pass."""
+    lines = body.splitlines()
+
+    extras = list(takewhile(lambda s: not s.startswith("class"), (s for s in lines if s)))
+
+    functions = defaultdict[str, list[WrappedFunction]](list)
+    core_like = ""
+    decorator = ""
+    func_def: list[str] | None = None
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Continuation of a function definition spanning several lines
+        if func_def is not None:
+            func_def.append(stripped)
+        elif core_like and stripped.startswith("def "):
+            func_def = [stripped.removeprefix("def ")]
+        else:
+            if m := _CORE_BOUND_PATTERN.match(stripped):
+                core_like = m.group(1)
+
+            if stripped.startswith("@"):
+                decorator = stripped.removeprefix("@")
+            elif stripped:
+                decorator = ""
+            continue
+
+        if not (end := _FUNC_END_PATTERN.search(func_def[-1])):
+            continue
+
+        func_def[-1] = func_def[-1][: end.end()]
+
+        # Normalize the function definition into one stripped line
+        normalized_func = " ".join(" ".join(func_def).split()).replace("( ", "(").replace(", )", ")")
+
+        # Store functions under the core_like key
+        functions[core_like].append(WrappedFunction(normalized_func, decorator))
+
+        decorator, func_def = "", None
+
+    return extras, functions
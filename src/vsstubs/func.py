@@ -1,7 +1,6 @@
 import sys
-import tempfile
-from collections.abc import Sequence
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from functools import partial
 from logging import getLogger
 from os import PathLike
 from pathlib import Path
@@ -10,22 +9,27 @@ from typing import IO, Any
 
 from rich.console import Console
 
-from .stubs import (
-    construct_implementation,
-    get_implementations_from_input,
-    load_plugins,
-    retrieve_plugins,
-    write_implementations,
-    write_plugins_bound,
-)
+from .cache import get_library_key
+from .constants import DEFAULT_PLUGIN_TIMEOUT
+from .context import GenerationContext, get_default_context, shares_core
+from .document import get_implementations_from_input, parse_stub
+from .profiling import phase
+from .snapshot import dump_snapshot, load_snapshot
 from .template import get_template
-from .types import Implementation, parse_type
-from .utils import _get_cores, _get_default_stubs_path, _index_by_namespace, register_destroy_cbs, running_via_cli
+from .types import Implementation, PluginInterface, parse_type
+from .utils import (
+    _get_cache_dir,
+    _get_default_stubs_path,
+    _index_by_namespace,
+    _write_stream_if_changed,
+    _write_text_if_changed,
+)
+from .wheel import get_wheel_name, get_wheel_version, prune_wheels, write_wheel
 
-log, console = getLogger(__name__), Console(stderr=True)
+log = getLogger(__name__)
 
 
-@register_destroy_cbs()
+@shares_core
 def output_stubs(
     input_file: str | PathLike[str] | IO[str] | None,
     output: str | PathLike[str] | IO[str] | None,
@@ -37,7 +41,16 @@ def output_stubs(
     remove: set[str] | None = None,
     *,
     compat: bool = False,
-) -> None:
+    cache: bool = False,
+    incremental: bool = False,
+    workers: int | None = None,
+    plugin_timeout: float = DEFAULT_PLUGIN_TIMEOUT,
+    jobs: int | None = None,
+    autoload: bool = True,
+    from_snapshot: str | PathLike[str] | None = None,
+    stream: bool = False,
+    context: GenerationContext | None = None,
+) -> dict[str, str] | None:
     """
     Generate or update VapourSynth stub output.
 
@@ -54,7 +67,7 @@ def output_stubs(
             Without `wheel`, this is the target `.pyi` file,
             or the default installed `vapoursynth-stubs/__init__.pyi` when omitted.
             With `wheel`, this is the directory where the wheel should be built;
-            if omitted, a temporary directory is created.
+            if omitted, the `wheels` folder of the user cache directory is used.
         template: If True, generate a blank template with no existing plugins
             unless explicitly provided via `load` or `add`.
         wheel: If True, build an installable `vapoursynth-stubs` wheel and print its path to stdout.
@@ -65,28 +78,118 @@ def output_stubs(
         add: A set of plugin names to add or update in the stubs.
         remove: A set of plugin names to remove from the stubs.
         compat: Enable return type compatibility for APIv3 plugins.
+        cache: Reuse the plugin signatures cached on disk by a previous run
+            as long as their library files are unchanged.
+        incremental: With `update`, only re-render the implementation blocks whose plugin fingerprint changed
+            and copy the other blocks of the input file as they are.
+        workers: Introspect the plugins in this many worker processes instead of the current process.
+            Each worker loads one library file at a time in a core of its own,
+            so a plugin that crashes or hangs is skipped and reported instead of stopping the run.
+            The signatures cache isn't used in this mode.
+        plugin_timeout: With `workers`, seconds allowed to load and introspect a single library file.
+        jobs: Construct the implementation blocks in this many processes once the plugins are introspected.
+            The output is the same as when they're constructed in the current process.
+        autoload: If False, only the plugins built into VapourSynth and the ones from `load` are introspected,
+            in a worker process whose core doesn't autoload the plugins, as with `workers`.
+            The core of this process and the other runs using it still autoload the installed plugins.
+            With `update`, the plugins that aren't loaded keep their current implementation.
+            The libraries the plugins to add or update come from aren't looked up, they must be given with `load`.
+        from_snapshot: Read the plugin signatures from a snapshot written by `snapshot_plugins`
+            instead of introspecting the plugins, so no plugin has to be loaded. Can't be combined with `load`.
+        stream: Introspect the plugins one at a time and write each implementation block as soon as it's constructed,
+            so only the plugin being written is held in memory. The output is the same.
+            Only for a full generation, it can't be combined with `input_file`, `wheel`, `template`, `update`,
+            `add`, `remove` or `jobs`.
+        context: The console to print to and what was introspected from the core by previous runs.
+            Defaults to a context shared by the runs of the process.
+            Every context uses the VapourSynth core of the process, see `GenerationContext`.
+
+    Returns:
+        The path of the written `.pyi` file or wheel and its `status`, either `written`,
+        or `unchanged` when the existing file already had the same content.
+        None when the stubs were written to a stream or the output failed.
     """
-    if not running_via_cli():
-        console.quiet = True
+    from .stubs import (
+        construct_implementations,
+        get_fingerprint,
+        load_plugins,
+        splice_implementations,
+        stream_stubs,
+        write_stubs,
+    )
+
+    context = context or get_default_context()
+    console = context.console
+
+    if stream and (input_file or wheel or template or update or add or remove or jobs):
+        raise ValueError("Only a full generation of the stubs can be streamed.")
+
+    snapshot = _read_snapshot(console, from_snapshot, load) if from_snapshot else None
+
+    if not autoload:
+        # In a worker process with a core of its own, the core of this process keeps autoloading the plugins.
+        workers = workers or 1
+
+    # The plugins are only introspected by the code paths that need them.
+    cache_dir = _get_cache_dir() if cache else None
 
     if load:
         console.print(f"Loading plugins from: {load}")
-        plugins_to_add = load_plugins(load)
+        plugins_to_add = (
+            set(context.introspect_isolated(tuple(map(str, load)), workers, plugin_timeout, autoload).loaded)
+            if workers
+            else load_plugins(load, context=context)
+        )
         add = plugins_to_add if not add else add | plugins_to_add
 
-    cores = _get_cores()
-    pinters = retrieve_plugins(cores)
+    if stream:
+        # The loaded plugins are part of a full generation already.
+        return _output_streamed(
+            console,
+            output,
+            partial(
+                stream_stubs,
+                _iter_sorted_pinters(context, load, cache_dir, workers, plugin_timeout, autoload, snapshot),
+                get_template(),
+                compat=compat,
+            ),
+        )
 
     if input_file:
         tmpl = Path(input_file).read_text() if isinstance(input_file, (str, PathLike)) else input_file.read()
         implementations = get_implementations_from_input(tmpl)
 
         if update:
-            impl_ns = [i.namespace for i in implementations]
-            console.print(f"Found {len(impl_ns)} plugins to update: {impl_ns}")
-            implementations = [
-                construct_implementation(pinter, compat=compat) for pinter in pinters if pinter.namespace in impl_ns
-            ]
+            old_impl = _index_by_namespace(implementations)
+            console.print(f"Found {len(old_impl)} plugins to update: {list(old_impl)}")
+            implementations = []
+            outdated = list[PluginInterface]()
+            # Computed once, to compare with the stubs and then to construct the outdated blocks
+            fingerprints = dict[str, str | None]()
+
+            pinters_map = _index_by_namespace(
+                _get_pinters(context, load, cache_dir, workers, plugin_timeout, autoload, snapshot)
+            )
+
+            for ns, old in old_impl.items():
+                if (pinter := pinters_map.get(ns)) is None:
+                    # Without autoloading, the plugins that weren't loaded are left as they are.
+                    if not autoload:
+                        implementations.append(old)
+                    continue
+
+                if incremental:
+                    fingerprints[ns] = fingerprint = get_fingerprint(pinter, compat=compat)
+
+                    if old.fingerprint and old.fingerprint == fingerprint and old.library == pinter.library:
+                        implementations.append(old)
+                        continue
+
+                outdated.append(pinter)
+
+            implementations.extend(
+                construct_implementations(outdated, compat=compat, jobs=jobs, fingerprints=fingerprints)
+            )
 
     elif template:
         tmpl = get_template()
@@ -95,7 +198,11 @@ def output_stubs(
         raise ValueError("You must provide a input file when checking or updating the stubs")
     else:
         tmpl = get_template()
-        implementations = [construct_implementation(pinter, compat=compat) for pinter in pinters]
+        implementations = construct_implementations(
+            _get_pinters(context, load, cache_dir, workers, plugin_timeout, autoload, snapshot),
+            compat=compat,
+            jobs=jobs,
+        )
 
     if add or remove:
         impl_map = _index_by_namespace(implementations)
@@ -106,14 +213,18 @@ def output_stubs(
         warn_msg = '[yellow]"{ns}" isn\'t a valid plugin namespace.[/yellow]'
 
         if add:
-            pinters_map = _index_by_namespace(pinters)
+            pinters_map = _index_by_namespace(
+                _get_pinters(context, load, cache_dir, workers, plugin_timeout, autoload, snapshot)
+            )
 
-            for ns in add:
-                if ns not in pinters_map:
-                    console.print(warn_msg.format(ns=ns))
-                    continue
+            for ns in add - pinters_map.keys():
+                console.print(warn_msg.format(ns=ns))
 
-                impl_map[ns] = construct_implementation(pinters_map[ns], compat=compat)
+            impl_map |= _index_by_namespace(
+                construct_implementations(
+                    [pinters_map[ns] for ns in add if ns in pinters_map], compat=compat, jobs=jobs
+                )
+            )
 
         if remove:
             for ns in remove:
@@ -126,77 +237,178 @@ def output_stubs(
         implementations = list(impl_map.values())
 
     log.debug("parse_type: %s", parse_type.cache_info())
+    log.debug("parse_stub: %s", parse_stub.cache_info())
+
+    spliced = (
+        splice_implementations(parse_stub(tmpl), implementations)
+        if incremental and update and input_file and not (add or remove)
+        else None
+    )
 
-    tmpl = write_implementations(implementations, tmpl)
-    tmpl = write_plugins_bound(implementations, tmpl)
+    tmpl = spliced if spliced is not None else write_stubs(implementations, tmpl)
 
     log.debug("output: %r", output)
 
     if isinstance(output, (str, PathLike, NoneType)):
         if wheel:
-            output_dir = Path(output or tempfile.mkdtemp(prefix="vsstubs_"))
+            output_dir = Path(output) if output else _get_cache_dir() / "wheels"
 
             if output_dir.exists() and not output_dir.is_dir():
                 console.print(f"[red]Error: Output path '{output_dir}' is not a directory.[/red]")
-                return
+                return None
 
             try:
-                wheel_path = build_wheel(output_dir, tmpl)
+                # Only the wheel of the current stubs is kept in the cache.
+                wheel_path, written = build_wheel(output_dir, tmpl, prune=not output)
                 print(wheel_path, file=sys.stdout)
-                console.print(f"[green]Wheel built successfully at:[/green] {wheel_path}")
+                console.print(f"[green]Wheel {'built' if written else 'unchanged'} at:[/green] {wheel_path}")
             except Exception as e:  # noqa: BLE001
                 console.print(f"[red]Error building wheel: {e}[/red]")
-                return
-        else:
-            output_path = Path(output) if output else _get_default_stubs_path()
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(tmpl)
-            console.print("[green]Done![/green]")
-            console.print(f"Stub written to {output_path}")
-    else:
-        output.write(tmpl)
+                return None
+
+            return {"path": wheel_path, "status": "written" if written else "unchanged"}
+
+        output_path = Path(output) if output else _get_default_stubs_path()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with phase("write_output"):
+            written = _write_text_if_changed(output_path, tmpl)
+
         console.print("[green]Done![/green]")
+        console.print(f"Stub {'written to' if written else 'unchanged at'} {output_path}")
 
+        return {"path": str(output_path), "status": "written" if written else "unchanged"}
 
-def check_stubs(input_file: str | PathLike[str] | IO[str]) -> dict[str, list[str]]:
+    with phase("write_output"):
+        output.write(tmpl)
+
+    console.print("[green]Done![/green]")
+
+    return None
+
+
+@shares_core
+def check_stubs(
+    input_file: str | PathLike[str] | IO[str],
+    *,
+    cache: bool = False,
+    workers: int | None = None,
+    plugin_timeout: float = DEFAULT_PLUGIN_TIMEOUT,
+    jobs: int | None = None,
+    load: Sequence[str | PathLike[str]] | None = None,
+    autoload: bool = True,
+    from_snapshot: str | PathLike[str] | None = None,
+    fast: bool = False,
+    stop_early: bool = False,
+    context: GenerationContext | None = None,
+) -> dict[str, Any]:
     """
     Check VapourSynth stubs.
 
     Args:
         input_file: Existing `.pyi` file to use as the base for checking stubs.
+        cache: Reuse the plugin signatures cached on disk by a previous run.
+        workers: Introspect the plugins in this many isolated worker processes, see `output_stubs`.
+        plugin_timeout: With `workers`, seconds allowed to load and introspect a single library file.
+        jobs: Construct the implementation blocks in this many processes, see `output_stubs`.
+        load: Optional plugin directory or library paths to load before checking.
+        autoload: If False, only check the plugins built into VapourSynth and the ones from `load`,
+            in a worker process whose core doesn't autoload the plugins, see `output_stubs`.
+        from_snapshot: Check against the plugin signatures of a snapshot instead of the loaded plugins.
+        fast: Only compare the library keys written in the implementation markers with the loaded plugins,
+            without introspecting or rendering them.
+            A plugin is reported as modified whenever its library file changed or has no key in the stubs.
+        stop_early: Stop at the first difference, so the result only holds that one.
+            The namespaces are compared first and the plugins are then introspected one at a time,
+            unless they come from `workers` or `from_snapshot`.
+        context: The console to print to and what was introspected from the core, see `output_stubs`.
+
+    Returns:
+        The namespaces only in the input (`old`), only loaded (`new`) and in both but different (`modified`),
+        and in `changes` what differs for each modified namespace:
+        the `added`, `removed` and `changed` functions of each core-bound class, the `description`
+        and the `extra_types`, or the `library` key with `fast`.
     """
-    if not running_via_cli():
-        console.quiet = True
+    from .stubs import construct_implementations, load_plugins
 
-    cores = _get_cores()
-    pinters = retrieve_plugins(cores)
+    context = context or get_default_context()
+    console = context.console
+
+    snapshot = _read_snapshot(console, from_snapshot, load) if from_snapshot else None
+
+    if not autoload:
+        workers = workers or 1
+
+    if snapshot is None and load and not workers:
+        load_plugins(load, context=context)
 
     tmpl = Path(input_file).read_text() if isinstance(input_file, (str, PathLike)) else input_file.read()
-    implementations = get_implementations_from_input(tmpl)
 
-    old_impl = _index_by_namespace(implementations)
-    new_impl = _index_by_namespace(construct_implementation(pinter, compat=False) for pinter in pinters)
+    if fast:
+        # Only the markers are read and no plugin is introspected.
+        old_impl: Mapping[str, Any] = parse_stub(tmpl).library_keys()
+        new_impl: Mapping[str, Any] = _get_library_keys(context, load, workers, plugin_timeout, autoload, snapshot)
+    elif stop_early and snapshot is None and not workers:
+        old_impl = _index_by_namespace(get_implementations_from_input(tmpl))
+        new_impl = _LazyImplementations(context, _get_cache_dir() if cache else None)
+    else:
+        pinters = _get_pinters(
+            context, load, _get_cache_dir() if cache else None, workers, plugin_timeout, autoload, snapshot
+        )
+        old_impl = _index_by_namespace(get_implementations_from_input(tmpl))
+        new_impl = _index_by_namespace(construct_implementations(pinters, compat=False, jobs=jobs))
+
+    if not autoload:
+        # The plugins that weren't loaded can't be compared.
+        old_impl = {ns: impl for ns, impl in old_impl.items() if ns in new_impl}
 
     old_keys, new_keys = set(old_impl), set(new_impl)
 
     only_old = old_keys - new_keys
     only_new = new_keys - old_keys
 
-    if only_old or only_new:
-        if only_old:
-            console.print(f"[yellow]Plugin(s) only in input file: {', '.join(sorted(only_old))}[/yellow]")
-        if only_new:
-            console.print(f"[yellow]New plugin(s) to be added: {' '.join(sorted(only_new))}[/yellow]")
-    else:
-        console.print("[green]Stubs are up to date![/green]")
+    if only_old:
+        console.print(f"[yellow]Plugin(s) only in input file: {', '.join(sorted(only_old))}[/yellow]")
+    if only_new:
+        console.print(f"[yellow]New plugin(s) to be added: {' '.join(sorted(only_new))}[/yellow]")
 
-    modified = [ns for ns in sorted(old_keys & new_keys) if _compare_plugins(old_impl[ns], new_impl[ns], ns)]
+    diff = _diff_library_keys if fast else _diff_plugins
+    changes = dict[str, dict[str, Any]]()
 
-    return {"old": list(only_old), "new": list(only_new), "modified": modified}
+    # Different namespaces are already a difference, no plugin needs to be introspected.
+    common = [] if stop_early and (only_old or only_new) else sorted(old_keys & new_keys)
 
+    with phase("compare"):
+        for ns in common:
+            if d := diff(old_impl[ns], new_impl[ns]):
+                changes[ns] = d
 
+                for field in d:
+                    if field == "library":
+                        console.print(f"The library of the plugin {ns} changed since the stubs were generated.")
+                    else:
+                        console.print(f'For the plugin {ns}, the "{field.replace("_", " ")}" differ.')
+
+                if stop_early:
+                    break
+
+    if not (only_old or only_new or changes):
+        console.print("[green]Stubs are up to date![/green]")
+
+    return {"old": list(only_old), "new": list(only_new), "modified": list(changes), "changes": changes}
+
+
+@shares_core
 def list_plugins(
-    input_file: str | PathLike[str] | IO[str] | None = None, load: Sequence[str | PathLike[str]] | None = None
+    input_file: str | PathLike[str] | IO[str] | None = None,
+    load: Sequence[str | PathLike[str]] | None = None,
+    *,
+    cache: bool = False,
+    workers: int | None = None,
+    plugin_timeout: float = DEFAULT_PLUGIN_TIMEOUT,
+    autoload: bool = True,
+    from_snapshot: str | PathLike[str] | None = None,
+    context: GenerationContext | None = None,
 ) -> list[dict[str, str]]:
     """
     List available VapourSynth plugins or plugin stubs present in an input file.
@@ -204,9 +416,16 @@ def list_plugins(
     Args:
         input_file: Optional path to an existing `.pyi` file. If provided, lists installed stub namespaces.
         load: Optional plugin directory or library paths to load before listing available plugins.
+        cache: Reuse the plugin signatures cached on disk by a previous run.
+        workers: Introspect the plugins in this many isolated worker processes, see `output_stubs`.
+        plugin_timeout: With `workers`, seconds allowed to load and introspect a single library file.
+        autoload: If False, only list the plugins built into VapourSynth and the ones from `load`.
+            They're introspected in a worker process, see `output_stubs`.
+        from_snapshot: List the plugins of a snapshot instead of the loaded plugins.
+        context: The console to print to and what was introspected from the core, see `output_stubs`.
     """
-    if not running_via_cli():
-        console.quiet = True
+    context = context or get_default_context()
+    console = context.console
 
     if input_file:
         tmpl = Path(input_file).read_text() if isinstance(input_file, (str, PathLike)) else input_file.read()
@@ -216,65 +435,271 @@ def list_plugins(
             for impl in sorted(implementations, key=lambda i: i.namespace)
         ]
 
-    if load:
-        load_plugins(load)
+    # Listing the plugins of an input file doesn't need the introspection machinery.
+    from .stubs import load_plugins
+
+    snapshot = _read_snapshot(console, from_snapshot, load) if from_snapshot else None
+
+    if not autoload:
+        workers = workers or 1
 
-    cores = _get_cores()
-    pinters = retrieve_plugins(cores)
+    if snapshot is None and load and not workers:
+        load_plugins(load, context=context)
+
+    pinters = _get_pinters(
+        context, load, _get_cache_dir() if cache else None, workers, plugin_timeout, autoload, snapshot
+    )
     return [
         {"namespace": pinter.namespace, "description": pinter.description}
         for pinter in sorted(pinters, key=lambda p: p.namespace)
     ]
 
 
-def _compare_plugins(old: Implementation, new: Implementation, ns: str) -> bool:
-    checks: list[tuple[str, Any, Any]] = [
-        ("functions", dict(old.functions), dict(new.functions)),
-        ("description", old.description, new.description),
-        ("extra types", old.extra_types, new.extra_types),
-    ]
-    has_diff = False
-    for field, old_val, new_val in checks:
-        if old_val != new_val:
-            console.print(f'For the plugin {ns}, the "{field}" differ.')
-            has_diff = True
-    return has_diff
+@shares_core
+def snapshot_plugins(
+    output: str | PathLike[str] | IO[str],
+    load: Sequence[str | PathLike[str]] | None = None,
+    *,
+    cache: bool = False,
+    workers: int | None = None,
+    plugin_timeout: float = DEFAULT_PLUGIN_TIMEOUT,
+    autoload: bool = True,
+    context: GenerationContext | None = None,
+) -> dict[str, str] | None:
+    """
+    Dump the namespace, description and function signatures of every plugin into a JSON snapshot.
 
+    The stubs can then be generated from the snapshot with `from_snapshot`,
+    on a machine where the plugins aren't installed.
 
-_PYPROJECT_TOML = """
-[build-system]
-requires = ["uv_build>=0.11.7,<0.12.0"]
-build-backend = "uv_build"
+    Args:
+        output: Path or stream where the snapshot should be written.
+        load: Optional plugin directory or library paths to load before taking the snapshot.
+        cache: Reuse the plugin signatures cached on disk by a previous run.
+        workers: Introspect the plugins in this many isolated worker processes, see `output_stubs`.
+        plugin_timeout: With `workers`, seconds allowed to load and introspect a single library file.
+        autoload: If False, only snapshot the plugins built into VapourSynth and the ones from `load`.
+            They're introspected in a worker process, see `output_stubs`.
+        context: The console to print to and what was introspected from the core, see `output_stubs`.
+
+    Returns:
+        The path of the snapshot and its `status`, either `written` or `unchanged`.
+        None when the snapshot was written to a stream.
+    """
+    from .stubs import load_plugins
 
-[project]
-name = "vapoursynth-stubs"
-version = "{version}"
-"""
+    context = context or get_default_context()
+    console = context.console
 
+    if not autoload:
+        workers = workers or 1
 
-def build_wheel(path: Path, tmpl: str) -> str:
-    import importlib.metadata
-    import shutil
+    if load and not workers:
+        load_plugins(load, context=context)
 
-    import build
-    import packaging.version
+    pinters = _get_pinters(context, load, _get_cache_dir() if cache else None, workers, plugin_timeout, autoload)
+    text, skipped = dump_snapshot(pinters)
+
+    for ns, reason in skipped.items():
+        console.print(f"[yellow]Skipped {ns}: {reason}[/yellow]")
+
+    if not isinstance(output, (str, PathLike)):
+        output.write(text)
+        console.print("[green]Done![/green]")
+        return None
 
-    src = path / "build_src"
-    if src.exists():
-        shutil.rmtree(src)
-    src.mkdir(parents=True)
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = _write_text_if_changed(output_path, text)
+    console.print("[green]Done![/green]")
+    console.print(f"Snapshot {'written to' if written else 'unchanged at'} {output_path}")
 
-    try:
-        v = packaging.version.parse(importlib.metadata.version("vsstubs"))
-        d = datetime.now().astimezone()
-        pyproject = _PYPROJECT_TOML.format(version=f"{v.base_version}.{d.strftime('%Y%m%d%H%M%S')}")
-        (src / "pyproject.toml").write_text(pyproject)
+    return {"path": str(output_path), "status": "written" if written else "unchanged"}
 
-        module = src / "src" / "vapoursynth-stubs"
-        module.mkdir(parents=True)
 
-        (module / "__init__.pyi").write_text(tmpl)
+def _output_streamed(
+    console: Console, output: str | PathLike[str] | IO[str] | None, write: Callable[[IO[str]], None]
+) -> dict[str, str] | None:
+    if isinstance(output, (str, PathLike, NoneType)):
+        output_path = Path(output) if output else _get_default_stubs_path()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with phase("stream"):
+            written = _write_stream_if_changed(output_path, write)
+
+        console.print("[green]Done![/green]")
+        console.print(f"Stub {'written to' if written else 'unchanged at'} {output_path}")
+
+        return {"path": str(output_path), "status": "written" if written else "unchanged"}
+
+    with phase("stream"):
+        write(output)
+
+    console.print("[green]Done![/green]")
+
+    return None
+
+
+def _iter_sorted_pinters(
+    context: GenerationContext,
+    load: Sequence[str | PathLike[str]] | None,
+    cache_dir: Path | None,
+    workers: int | None,
+    plugin_timeout: float,
+    autoload: bool,
+    snapshot: Sequence[PluginInterface] | None,
+) -> Iterable[PluginInterface]:
+    if snapshot is not None or workers:
+        pinters = _get_pinters(context, load, cache_dir, workers, plugin_timeout, autoload, snapshot)
+        return sorted(pinters, key=lambda p: p.namespace)
+
+    from .stubs import iter_plugin_interfaces
+
+    # Introspected as they are consumed, bypassing the plugin interfaces kept by the context.
+    return iter_plugin_interfaces(
+        sorted(context.plugins(), key=lambda p: p.namespace), context.cores(), cache_dir, context=context
+    )
+
+
+def _get_pinters(
+    context: GenerationContext,
+    load: Sequence[str | PathLike[str]] | None,
+    cache_dir: Path | None,
+    workers: int | None,
+    plugin_timeout: float,
+    autoload: bool,
+    snapshot: Sequence[PluginInterface] | None = None,
+) -> Sequence[PluginInterface]:
+    if snapshot is not None:
+        return snapshot
+
+    if workers:
+        return context.introspect_isolated(tuple(map(str, load or ())), workers, plugin_timeout, autoload).plugins
+
+    return context.plugin_interfaces(cache_dir)
+
+
+def _read_snapshot(
+    console: Console, path: str | PathLike[str], load: Sequence[str | PathLike[str]] | None
+) -> list[PluginInterface]:
+    if load:
+        raise ValueError("Plugins can't be loaded when the signatures are read from a snapshot.")
+
+    console.print(f"Reading the plugin signatures from: {path}")
+
+    with phase("read_snapshot"):
+        return load_snapshot(Path(path).read_text())
+
+
+class _LazyImplementations(Mapping[str, Implementation]):
+    """Implementations of the loaded plugins, each plugin being introspected when it's looked up."""
+
+    def __init__(self, context: GenerationContext, cache_dir: Path | None) -> None:
+        self._context = context
+        self._plugins = _index_by_namespace(context.plugins())
+        self._cache_dir = cache_dir
+
+    def __getitem__(self, ns: str) -> Implementation:
+        from .stubs import construct_implementation, iter_plugin_interfaces
+
+        pinter = next(
+            iter_plugin_interfaces([self._plugins[ns]], self._context.cores(), self._cache_dir, context=self._context)
+        )
+        return construct_implementation(pinter, compat=False)
+
+    def __contains__(self, ns: object) -> bool:
+        return ns in self._plugins
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._plugins)
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+
+def _get_library_keys(
+    context: GenerationContext,
+    load: Sequence[str | PathLike[str]] | None,
+    workers: int | None,
+    plugin_timeout: float,
+    autoload: bool,
+    snapshot: Sequence[PluginInterface] | None,
+) -> dict[str, str | None]:
+    if snapshot is not None or workers:
+        pinters = _get_pinters(context, load, None, workers, plugin_timeout, autoload, snapshot)
+        return {p.namespace: p.library for p in pinters}
+
+    return {p.namespace: get_library_key(p) for p in context.plugins()}
+
+
+def _diff_library_keys(old: str | None, new: str | None) -> dict[str, Any]:
+    if old is not None and old == new:
+        return {}
+
+    return {"library": {"old": old, "new": new}}
+
+
+def _diff_plugins(old: Implementation, new: Implementation) -> dict[str, Any]:
+    """
+    Get the differences of a plugin between the input stubs and its loaded version.
+
+    The functions are matched by name in each core-bound class and reported as `added`, `removed`
+    or `changed` with their signature strings.
+    A changed function whose decorator differs also gets the `old` and `new` decorators in `wrapper`.
+    """
+    diff = dict[str, Any]()
+    functions = dict[str, dict[str, Any]]()
+
+    for core_name in dict.fromkeys([*old.functions, *new.functions]):
+        old_funcs = {f.signature.partition("(")[0]: f for f in old.functions.get(core_name, ())}
+        new_funcs = {f.signature.partition("(")[0]: f for f in new.functions.get(core_name, ())}
+
+        added = {name: f.signature for name, f in new_funcs.items() if name not in old_funcs}
+        removed = {name: f.signature for name, f in old_funcs.items() if name not in new_funcs}
+        changed = dict[str, dict[str, Any]]()
+
+        for name, f in new_funcs.items():
+            if name not in old_funcs or old_funcs[name] == f:
+                continue
+
+            old_func = old_funcs[name]
+            changed[name] = {"old": old_func.signature, "new": f.signature}
+
+            if old_func.wrapper != f.wrapper:
+                changed[name]["wrapper"] = {"old": old_func.wrapper, "new": f.wrapper}
+
+        if added or removed or changed:
+            functions[core_name] = {"added": added, "removed": removed, "changed": changed}
+
+    if functions:
+        diff["functions"] = functions
+    if old.description != new.description:
+        diff["description"] = {"old": old.description, "new": new.description}
+    if old.extra_types != new.extra_types:
+        diff["extra_types"] = {"old": list(old.extra_types or ()), "new": list(new.extra_types or ())}
+
+    return diff
+
+
+def build_wheel(path: Path, tmpl: str, prune: bool = False) -> tuple[str, bool]:
+    """
+    Return the path of the wheel holding `tmpl` and whether it had to be written.
+
+    With `prune`, the other `vapoursynth-stubs` wheels of `path` are deleted, so the wheels of stubs
+    that changed since don't pile up.
+    """
+    with phase("build_wheel"):
+        version = get_wheel_version(tmpl)
+        wheel_path = path / get_wheel_name(version)
+
+        # The version is derived from the content, so an existing wheel holds the same stubs.
+        if written := not wheel_path.is_file():
+            write_wheel(path, tmpl, version)
+        else:
+            log.debug("Reusing wheel %s", wheel_path)
+
+        if prune:
+            for pruned in prune_wheels(path, wheel_path):
+                log.debug("Deleted the outdated wheel %s", pruned)
 
-        return build.ProjectBuilder(src).build("wheel", path)
-    finally:
-        shutil.rmtree(src, ignore_errors=True)
+        return str(wheel_path), written
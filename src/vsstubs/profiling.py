@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+__all__ = ["Profiler", "phase", "profiling", "record_cache", "record_library", "start_profiling", "stop_profiling"]
+
+# Each thread records into its own profiler, so concurrent runs don't mix their phases.
+_PROFILER = ContextVar["Profiler | None"]("_PROFILER", default=None)
+
+
+class Profiler:
+    """
+    Wall and CPU time and number of calls of each phase of a run,
+    with the time each plugin and library spent in them and the hit ratio of the main caches.
+
+    Phases can be nested, e.g. `construct` within `stream`, so their times don't add up to the total.
+    """
+
+    __slots__ = ("_cache_start", "_start", "caches", "libraries", "phases", "plugins")
+
+    def __init__(self) -> None:
+        self.phases = dict[str, list[float]]()
+        """Number of calls, wall and CPU time of each phase."""
+        self.plugins = defaultdict[str, dict[str, float]](dict)
+        """Wall time of each plugin in each phase."""
+        self.libraries = defaultdict[str, dict[str, float]](dict)
+        """Wall time of each library file in each phase."""
+        self.caches = dict[str, list[int]]()
+        """Hits, misses and size of the caches that aren't `functools` ones, e.g. of `GenerationContext`."""
+
+        self._start = (time.perf_counter(), time.process_time())
+        self._cache_start = {name: cache_info() for name, cache_info in _get_cache_infos().items()}
+
+    def add(self, name: str, wall: float, cpu: float, plugin: str | None = None, library: str | None = None) -> None:
+        """Count a call of the phase `name`."""
+        stats = self.phases.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += wall
+        stats[2] += cpu
+
+        if plugin is not None:
+            self.plugins[plugin][name] = self.plugins[plugin].get(name, 0.0) + wall
+
+        if library is not None:
+            self.libraries[library][name] = self.libraries[library].get(name, 0.0) + wall
+
+    def report(self) -> dict[str, Any]:
+        """The JSON-compatible report of everything recorded since the profiler was created."""
+        caches = dict[str, dict[str, Any]]()
+
+        for name, cache_info in _get_cache_infos().items():
+            info, start = cache_info(), self._cache_start[name]
+
+            # A cache cleared during the run only has its counts since then.
+            if info.hits >= start.hits and info.misses >= start.misses:
+                hits, misses = info.hits - start.hits, info.misses - start.misses
+            else:
+                hits, misses = info.hits, info.misses
+
+            caches[name] = {
+                "hits": hits,
+                "misses": misses,
+                "ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                "size": info.currsize,
+            }
+
+        for name, (hits, misses, size) in self.caches.items():
+            caches[name] = {
+                "hits": hits,
+                "misses": misses,
+                "ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+                "size": size,
+            }
+
+        return {
+            "wall": _round(time.perf_counter() - self._start[0]),
+            "cpu": _round(time.process_time() - self._start[1]),
+            "phases": {
+                name: {"calls": int(calls), "wall": _round(wall), "cpu": _round(cpu)}
+                for name, (calls, wall, cpu) in self.phases.items()
+            },
+            "caches": caches,
+            "plugins": {ns: {k: _round(v) for k, v in times.items()} for ns, times in sorted(self.plugins.items())},
+            "libraries": {
+                path: {k: _round(v) for k, v in times.items()} for path, times in sorted(self.libraries.items())
+            },
+        }
+
+
+def start_profiling() -> Profiler:
+    """Record the phases of everything that runs from now on in the current thread in a new profiler."""
+    profiler = Profiler()
+    _PROFILER.set(profiler)
+    return profiler
+
+
+def stop_profiling() -> Profiler | None:
+    """Stop recording and return the profiler that was recording in the current thread, if any."""
+    profiler = _PROFILER.get()
+    _PROFILER.set(None)
+    return profiler
+
+
+@contextmanager
+def profiling() -> Iterator[Profiler]:
+    """
+    Record the phases of the runs within the block, in the current thread.
+
+    Example:
+        ```python
+        with profiling() as profiler:
+            output_stubs(None, "output.pyi")
+
+        report = profiler.report()
+        ```
+    """
+    profiler = Profiler()
+    token = _PROFILER.set(profiler)
+
+    try:
+        yield profiler
+    finally:
+        _PROFILER.reset(token)
+
+
+@contextmanager
+def phase(name: str, plugin: str | None = None, library: str | None = None) -> Iterator[None]:
+    """Time the block as a call of the phase `name` when profiling, and add it to `plugin` and `library` if given."""
+    if (profiler := _PROFILER.get()) is None:
+        yield
+        return
+
+    wall, cpu = time.perf_counter(), time.process_time()
+
+    try:
+        yield
+    finally:
+        profiler.add(name, time.perf_counter() - wall, time.process_time() - cpu, plugin, library)
+
+
+def record_library(library: str, name: str, wall: float) -> None:
+    """Add the wall time a library spent in the phase `name` elsewhere, e.g. in a worker process."""
+    if (profiler := _PROFILER.get()) is not None:
+        profiler.libraries[library][name] = profiler.libraries[library].get(name, 0.0) + wall
+
+
+def record_cache(name: str, hit: bool, size: int) -> None:
+    """Count a lookup in the cache `name`, holding `size` entries afterwards."""
+    if (profiler := _PROFILER.get()) is not None:
+        stats = profiler.caches.setdefault(name, [0, 0, 0])
+        stats[0 if hit else 1] += 1
+        stats[2] = size
+
+
+def _get_cache_infos() -> dict[str, Callable[[], _CacheInfo]]:
+    from .document import parse_stub
+    from .stubs import _format_annotation
+    from .types import parse_type
+
+    return {
+        "parse_type": parse_type.cache_info,
+        "_format_annotation": _format_annotation.cache_info,
+        "parse_stub": parse_stub.cache_info,
+    }
+
+
+def _round(seconds: float) -> float:
+    return round(seconds, 6)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import sys
+from collections.abc import Callable
+from inspect import signature
+from logging import getLogger
+from typing import IO, Any
+
+from .context import GenerationContext, get_default_context
+from .func import check_stubs, list_plugins, output_stubs
+
+log = getLogger(__name__)
+
+# JSON-RPC 2.0 error codes
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INVALID_PARAMS = -32602
+_SERVER_ERROR = -32000
+
+
+def _resolve_output(input: str | None, output: str | None) -> str | None:
+    if output == "-":
+        raise ValueError("Writing the stubs to stdout isn't supported by the server.")
+
+    if output == "@":
+        if input is None:
+            raise ValueError("You must provide an input when output is '@'.")
+        return input
+
+    return output
+
+
+def _check(context: GenerationContext, input: str, cache: bool = False) -> Any:
+    return check_stubs(input, cache=cache, context=context)
+
+
+def _plugins(
+    context: GenerationContext, input: str | None = None, load: list[str] | None = None, cache: bool = False
+) -> Any:
+    return list_plugins(input, load, cache=cache, context=context)
+
+
+def _add(
+    context: GenerationContext,
+    plugins: list[str],
+    input: str | None = None,
+    output: str | None = None,
+    load: list[str] | None = None,
+    compat: bool = False,
+    cache: bool = False,
+) -> Any:
+    return output_stubs(
+        input,
+        _resolve_output(input, output),
+        load=load,
+        add=set(plugins),
+        compat=compat,
+        cache=cache,
+        context=context,
+    )
+
+
+def _remove(
+    context: GenerationContext,
+    plugins: list[str],
+    input: str | None = None,
+    output: str | None = None,
+    load: list[str] | None = None,
+    compat: bool = False,
+    cache: bool = False,
+) -> Any:
+    return output_stubs(
+        input,
+        _resolve_output(input, output),
+        load=load,
+        remove=set(plugins),
+        compat=compat,
+        cache=cache,
+        context=context,
+    )
+
+
+def _update(
+    context: GenerationContext,
+    input: str,
+    output: str | None = None,
+    load: list[str] | None = None,
+    compat: bool = False,
+    cache: bool = False,
+    incremental: bool = False,
+) -> Any:
+    return output_stubs(
+        input,
+        _resolve_output(input, output),
+        load=load,
+        update=True,
+        compat=compat,
+        cache=cache,
+        incremental=incremental,
+        context=context,
+    )
+
+
+_METHODS: dict[str, Callable[..., Any]] = {
+    "check": _check,
+    "plugins": _plugins,
+    "add": _add,
+    "remove": _remove,
+    "update": _update,
+}
+
+
+def _error(code: int, message: str) -> dict[str, Any]:
+    return {"error": {"code": code, "message": message}}
+
+
+def _handle(context: GenerationContext, method: str, params: Any) -> dict[str, Any]:
+    if method not in _METHODS:
+        return _error(_METHOD_NOT_FOUND, f"Unknown method: {method}")
+
+    if not isinstance(params, dict):
+        return _error(_INVALID_PARAMS, "params must be an object")
+
+    handler = _METHODS[method]
+
+    try:
+        signature(handler).bind(context, **params)
+    except TypeError as e:
+        return _error(_INVALID_PARAMS, str(e))
+
+    try:
+        return {"result": handler(context, **params)}
+    except Exception as e:
+        log.debug("%s request failed", method, exc_info=True)
+        return _error(_SERVER_ERROR, f"{type(e).__name__}: {e}")
+
+
+def _respond(stdout: IO[str], rid: Any, response: dict[str, Any]) -> None:
+    stdout.write(json.dumps({"jsonrpc": "2.0", "id": rid, **response}) + "\n")
+    stdout.flush()
+
+
+def serve(
+    stdin: IO[str] | None = None, stdout: IO[str] | None = None, *, context: GenerationContext | None = None
+) -> None:
+    """
+    Answer `check`, `plugins`, `add`, `remove` and `update` requests read line by line from `stdin`.
+
+    Each request is a JSON-RPC 2.0 object whose `params` mirror the CLI options,
+    e.g. `{"jsonrpc": "2.0", "id": 1, "method": "add", "params": {"plugins": ["resize2"], "input": "a.pyi"}}`.
+    One response line is written to `stdout` per request, requests without an `id` are notifications.
+    The `shutdown` method stops the server.
+
+    The VapourSynth core, the introspected plugins and the last parsed stubs stay in memory between requests,
+    in `context` or the default context if None.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    context = context or get_default_context()
+
+    for line in stdin:
+        if not line.strip():
+            continue
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            _respond(stdout, None, _error(_PARSE_ERROR, str(e)))
+            continue
+
+        if not isinstance(request, dict) or not isinstance(method := request.get("method"), str):
+            _respond(stdout, None, _error(_INVALID_REQUEST, "Invalid request"))
+            continue
+
+        response: dict[str, Any]
+
+        if method == "shutdown":
+            response = {"result": None}
+        else:
+            # Anything printed while handling the request must not corrupt the protocol stream.
+            with contextlib.redirect_stdout(sys.stderr):
+                response = _handle(context, method, request.get("params", {}))
+
+        if "id" in request:
+            _respond(stdout, request["id"], response)
+
+        if method == "shutdown":
+            break
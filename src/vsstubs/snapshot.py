@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from logging import getLogger
+
+from .types import PluginInterface
+from .utils import _get_vsstubs_version
+
+log = getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+def dump_snapshot(pinters: Iterable[PluginInterface]) -> tuple[str, dict[str, str]]:
+    """
+    Serialize the interfaces of the plugins into a compact, versioned JSON snapshot.
+
+    Returns:
+        The snapshot and the reason each plugin that couldn't be serialized was left out of it.
+    """
+    from vapoursynth import __api_version__
+
+    plugins = list[dict[str, object]]()
+    skipped = dict[str, str]()
+
+    for pinter in sorted(pinters, key=lambda p: p.namespace):
+        try:
+            plugins.append(pinter.as_dict())
+        except TypeError as e:
+            log.debug("Plugin '%s' can't be serialized", pinter.namespace, exc_info=True)
+            skipped[pinter.namespace] = str(e)
+
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "vsstubs": _get_vsstubs_version(),
+        "api_version": list(__api_version__),
+        "plugins": plugins,
+    }
+
+    return json.dumps(data, separators=(",", ":")) + "\n", skipped
+
+
+def load_snapshot(text: str) -> list[PluginInterface]:
+    """Rebuild the plugin interfaces from a snapshot written by `dump_snapshot`."""
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid snapshot: {e}") from e
+
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        version = data.get("version") if isinstance(data, dict) else None
+        raise ValueError(f"Unsupported snapshot version {version!r}, expected {SNAPSHOT_VERSION}.")
+
+    try:
+        return [PluginInterface.from_dict(p) for p in data["plugins"]]
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid snapshot: {type(e).__name__}: {e}") from e
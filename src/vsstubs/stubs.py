@@ -1,31 +1,35 @@
 from __future__ import annotations
 
-import re
+import hashlib
+import multiprocessing
+import pickle
+import shutil
+import tempfile
 from collections import defaultdict
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from functools import cache
-from inspect import Parameter
-from itertools import takewhile
+from inspect import Parameter, Signature, formatannotation
+from itertools import repeat
 from logging import getLogger
 from os import PathLike
 from pathlib import Path
-from typing import Any, is_typeddict
-
-from vapoursynth import Error, core
+from typing import IO, TYPE_CHECKING, Any, is_typeddict
 
+from .cache import get_library_key, get_plugin_key, read_cached_plugin, write_cached_plugin
 from .constants import (
-    _ATTR_IMPL_END,
-    _ATTR_IMPL_START,
-    _CORE_IMPL_END,
     _CORE_IMPL_START,
-    _IMPL_END,
+    _CORE_NAMES,
     _IMPL_START,
-    _PLUGINS_IMPL_END,
     _PLUGINS_IMPL_START,
     _callback_signatures,
     _wrappers,
 )
+from .context import GenerationContext, _clear_plugins, get_default_context
+from .document import StubDocument, parse_stub
+from .profiling import phase
 from .types import (
+    Attribute,
     FunctionInterface,
     Implementation,
     PluginInterface,
@@ -34,17 +38,30 @@ from .types import (
     _CoreLike,
     parse_type,
 )
-from .utils import _get_cores, _get_dir, _get_plugins, _get_typed_dict_repr, _replace_known_callback_signature
+from .utils import (
+    _get_typed_dict_repr,
+    _get_vsstubs_version,
+    _index_by_namespace,
+    _replace_known_callback_signature,
+)
+
+if TYPE_CHECKING:
+    from vapoursynth import Plugin
 
 log = getLogger(__name__)
 
 
-def load_plugins(paths: Iterable[str | PathLike[str]]) -> set[str]:
+def load_plugins(paths: Iterable[str | PathLike[str]], *, context: GenerationContext | None = None) -> set[str]:
     """
-    Load the plugins from a list of dll or path folders.
+    Load the plugins from a list of dll or path folders in the core of `context`, the default context if None.
 
     Returns the new loaded namespace plugins.
     """
+    from vapoursynth import Error
+
+    context = context or get_default_context()
+    core = context.core
+
     old_plugins = {p.namespace for p in core.plugins()}
 
     for path in paths:
@@ -53,53 +70,144 @@ def load_plugins(paths: Iterable[str | PathLike[str]]) -> set[str]:
         if not path.exists():
             raise ValueError(f'This path "{path}" doesn\'t exist.')
 
-        if path.is_dir():
-            core.std.LoadAllPlugins(str(path))
-        else:
-            # std.LoadAllPlugins silently skips the plugins that fail to load.
-            try:
-                core.std.LoadPlugin(str(path))
-            except Error:
-                log.exception("")
+        with phase("load_plugins", library=str(path)):
+            if path.is_dir():
+                core.std.LoadAllPlugins(str(path))
+            else:
+                # std.LoadAllPlugins silently skips the plugins that fail to load.
+                try:
+                    core.std.LoadPlugin(str(path))
+                except Error:
+                    log.exception("")
+
+    # The plugins and the namespaces bound to each core-like changed, for every context using this core.
+    _clear_plugins(core)
 
-    return {p.namespace for p in _get_plugins()} - old_plugins
+    return {p.namespace for p in context.plugins()} - old_plugins
 
 
-def retrieve_plugins(core_like: Sequence[_CoreLike]) -> Sequence[PluginInterface]:
+def retrieve_plugins(
+    core_like: Sequence[_CoreLike], cache_dir: Path | None = None, *, context: GenerationContext | None = None
+) -> Sequence[PluginInterface]:
     """
     Get a sequence of PluginInferface.
 
     A PluginInferface offers an interface for each core-like it owns with its functions attached to it.
+
+    If `cache_dir` is given, the signatures of each plugin are read from and stored in it,
+    so unchanged plugins don't need to be introspected again.
+    The plugins are the ones loaded in the core of `context`, the default context if None.
     """
-    plugins = list[PluginInterface]()
+    context = context or get_default_context()
+    return list(iter_plugin_interfaces(context.plugins(), core_like, cache_dir, context=context))
+
+
+def iter_plugin_interfaces(
+    plugins: Iterable[Plugin],
+    core_like: Sequence[_CoreLike],
+    cache_dir: Path | None = None,
+    *,
+    context: GenerationContext | None = None,
+) -> Iterator[PluginInterface]:
+    """Introspect the given plugins one at a time, as they are consumed. See `retrieve_plugins`."""
+    context = context or get_default_context()
+
+    for plugin in plugins:
+        if cache_dir is not None:
+            with phase("read_cache", plugin.namespace):
+                key = get_plugin_key(plugin)
+                cached = read_cached_plugin(cache_dir, plugin.namespace, key)
+
+            if cached is not None:
+                yield cached
+                continue
 
-    for plugin in _get_plugins():
-        functions = defaultdict[str, list[FunctionInterface]](list)
+        with phase("introspect", plugin.namespace):
+            pinter = retrieve_plugin(plugin, core_like, context=context)
 
-        for cl in core_like:
-            # Some plugins only have vs.Core as bound core
-            if plugin.namespace not in _get_dir(cl):
-                continue
+        if cache_dir is not None:
+            write_cached_plugin(cache_dir, key, pinter)
 
-            # Get the actual plugin attached to its core to get the right functions signatures.
-            if cl is not core.core:
-                plugin = getattr(cl, plugin.namespace)
+        yield pinter
 
-            functions[cl.__class__.__name__].extend(
-                # Only gets the functions that __dir__ provides
-                FunctionInterface(f.name, f.__signature__)
-                for f in plugin.functions()
-                if f.name in _get_dir(plugin)
-            )
 
-        plugins.append(PluginInterface(plugin.namespace, functions, plugin.name))
+def retrieve_plugin(
+    plugin: Plugin, core_like: Sequence[_CoreLike], *, context: GenerationContext | None = None
+) -> PluginInterface:
+    """Get the PluginInterface of a single loaded plugin."""
+    context = context or get_default_context()
+
+    functions = defaultdict[str, list[FunctionInterface]](list)
+    library = get_library_key(plugin)
+
+    for cl in core_like:
+        # Some plugins only have vs.Core as bound core
+        if plugin.namespace not in context.dir(cl):
+            continue
 
-    return plugins
+        # Get the actual plugin attached to its core to get the right functions signatures.
+        if cl is not context.core:
+            plugin = getattr(cl, plugin.namespace)
 
+        functions[cl.__class__.__name__].extend(
+            # Only gets the functions that __dir__ provides
+            FunctionInterface(f.name, f.__signature__)
+            for f in plugin.functions()
+            if f.name in context.dir(plugin)
+        )
+
+    return PluginInterface(plugin.namespace, functions, plugin.name, library)
 
-def construct_implementation(interface: PluginInterface, *, compat: bool) -> Implementation:
-    """Contructs a full implementation block with all the functions for all the cores-like."""
 
+def get_fingerprint(interface: PluginInterface, *, compat: bool) -> str | None:
+    """
+    Get a short hash of everything an implementation block is constructed from.
+
+    Each function is hashed by its signature as introspected, rendered like in the blocks
+    but without parsing the annotations, so it's much cheaper than constructing the block.
+    The library key isn't part of it, so a rebuilt library with the same signatures keeps the same fingerprint.
+    Returns None if the interface can't be fingerprinted.
+    """
+    digest = hashlib.sha256(
+        f"{_get_vsstubs_version()}\0{compat}\0{interface.namespace}\0{interface.description}".encode()
+    )
+
+    try:
+        for core_name, functions in interface.functions.items():
+            digest.update(f"\0{core_name}".encode())
+
+            for function in functions:
+                signature = function.signature
+                rendered = _render_signature(
+                    ((param, param.annotation) for param in signature.parameters.values()), signature.return_annotation
+                )
+                digest.update(f"\0{function.name}{rendered}".encode())
+
+                # Only the name of a TypedDict is rendered, not its fields.
+                if is_typeddict(signature.return_annotation):
+                    digest.update(_get_typed_dict_repr(signature.return_annotation).encode())
+    except TypeError:
+        log.debug("Plugin '%s' can't be fingerprinted", interface.namespace, exc_info=True)
+        return None
+
+    return digest.hexdigest()[:16]
+
+
+def construct_implementation(
+    interface: PluginInterface, *, compat: bool, fingerprint: str | None = None
+) -> Implementation:
+    """
+    Contructs a full implementation block with all the functions for all the cores-like.
+
+    `fingerprint` is the one of `interface` if it was already computed with `get_fingerprint`.
+    """
+    with phase("construct", interface.namespace):
+        return _construct_implementation(interface, compat=compat, fingerprint=fingerprint)
+
+
+def _construct_implementation(
+    interface: PluginInterface, *, compat: bool, fingerprint: str | None = None
+) -> Implementation:
     functions_map = dict[str, list[WrappedFunction]]()
     extras = list[str]()
 
@@ -107,15 +215,15 @@ def construct_implementation(interface: PluginInterface, *, compat: bool) -> Imp
         functions_list = list[WrappedFunction]()
 
         for function in functions:
-            parameters = function.signature.parameters.copy()
-
-            for k, v in parameters.items():
-                parameters[k] = v.replace(annotation=parse_type(v.annotation))
+            parameters = function.signature.parameters
+            annotations = {name: parse_type(param.annotation) for name, param in parameters.items()}
 
             # Replaces the anonymous callback types to known signatures.
             if param_names := _callback_signatures.get(interface.namespace, {}).get(function.name):
                 for name in param_names:
-                    parameters[name] = _replace_known_callback_signature(parameters[name], interface, function)
+                    annotations[name] = _replace_known_callback_signature(
+                        parameters[name].replace(annotation=annotations[name]), interface, function
+                    ).annotation
 
             if function.signature.return_annotation == Any and compat:
                 return_annotation = VideoNodeType()
@@ -123,9 +231,8 @@ def construct_implementation(interface: PluginInterface, *, compat: bool) -> Imp
             else:
                 return_annotation = parse_type(function.signature.return_annotation, True)
 
-            signature = function.signature.replace(
-                parameters=(Parameter("self", Parameter.POSITIONAL_ONLY), *parameters.values()),
-                return_annotation=return_annotation,
+            signature = _render_signature(
+                ((param, annotations[name]) for name, param in parameters.items()), return_annotation
             )
 
             wrapper = (
@@ -136,122 +243,312 @@ def construct_implementation(interface: PluginInterface, *, compat: bool) -> Imp
 
             functions_list.append(WrappedFunction(f"{function.name}{signature}: ...", wrapper))
 
-            if is_typeddict(td := signature.return_annotation):
+            if is_typeddict(td := return_annotation):
                 extras.append(_get_typed_dict_repr(td))
 
         functions_map[core_name] = functions_list
 
-    return Implementation(interface.namespace, functions_map, interface.description, extras)
+    return Implementation(
+        interface.namespace,
+        functions_map,
+        interface.description,
+        extras,
+        fingerprint if fingerprint is not None else get_fingerprint(interface, compat=compat),
+        interface.library,
+    )
 
 
-def get_implementations_from_input(text: str) -> list[Implementation]:
-    """Parse a file to extract plugin implementations."""
+def construct_implementations(
+    interfaces: Iterable[PluginInterface],
+    *,
+    compat: bool,
+    jobs: int | None = None,
+    fingerprints: Mapping[str, str | None] | None = None,
+) -> list[Implementation]:
+    """
+    Constructs the implementation blocks of several plugins, in the order of `interfaces`.
 
-    plugins_impl_block_regex = rf"{_PLUGINS_IMPL_START}(.*?){_PLUGINS_IMPL_END}"
+    With `jobs`, the blocks are constructed by that many processes from the pickled interfaces,
+    and the interfaces that can't be pickled are constructed in the current process.
+    `fingerprints` holds the fingerprints already computed, by namespace.
+    """
+    interfaces = list(interfaces)
+    fingerprints = fingerprints or {}
+
+    if not jobs or jobs < 2 or len(interfaces) < 2:
+        return [
+            construct_implementation(interface, compat=compat, fingerprint=fingerprints.get(interface.namespace))
+            for interface in interfaces
+        ]
+
+    # Pickling is much cheaper than `as_dict` and keeps the annotations as they are.
+    pickled = dict[int, bytes]()
+
+    for i, interface in enumerate(interfaces):
+        try:
+            pickled[i] = pickle.dumps(interface)
+        except (AttributeError, TypeError, pickle.PicklingError):
+            log.debug("Plugin '%s' can't be sent to a worker process", interface.namespace, exc_info=True)
+
+    constructed = dict[int, Implementation]()
+
+    if len(pickled) > 1:
+        jobs = min(jobs, len(pickled))
+
+        with (
+            phase("construct_pool"),
+            ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn")) as executor,
+        ):
+            results = executor.map(
+                _construct_pickled,
+                pickled.values(),
+                repeat(compat),
+                [fingerprints.get(interfaces[i].namespace) for i in pickled],
+                chunksize=max(1, len(pickled) // (jobs * 4)),
+            )
+            constructed = dict(zip(pickled, results, strict=True))
 
-    plugins_impl_block_matched = re.search(plugins_impl_block_regex, text, re.DOTALL)
+    return [
+        constructed[i]
+        if i in constructed
+        else construct_implementation(interface, compat=compat, fingerprint=fingerprints.get(interface.namespace))
+        for i, interface in enumerate(interfaces)
+    ]
 
-    if not plugins_impl_block_matched:
-        return []
 
-    # Regex to capture class blocks like "_Core_bound", "_VideoNode_bound" or "_AudioNode_bound"
-    plugins_impl_block_pattern_text = r"class _(\w+)_bound:\s*class Plugin.*?:([\s\S]*?)(?=\n\s*class _\w+_bound:|\Z)"
-    plugins_impl_block_pattern = re.compile(plugins_impl_block_pattern_text, re.MULTILINE)
+def _construct_pickled(data: bytes, compat: bool, fingerprint: str | None) -> Implementation:
+    return construct_implementation(pickle.loads(data), compat=compat, fingerprint=fingerprint)
 
-    # Regex to capture decorator + full function definition lines
-    func_pattern_text = r"^\s*(?:@([^\n]*))?\s*\n?\s*def ([\s\S]+?-> [\w\[\], |]+: \.\.\.)"
-    func_pattern = re.compile(func_pattern_text, re.MULTILINE)
 
-    implementations = list[Implementation]()
+@cache
+def _format_annotation(annotation: Any) -> str:
+    return formatannotation(annotation)
 
-    # Regex to capture <implementation/{plugin_name}>
-    impl_capture_regex = rf"{_IMPL_START.format(name='([^>]+)')}(.*?){_IMPL_END.format(name='\\1')}"
 
-    for name, body in re.findall(impl_capture_regex, plugins_impl_block_matched.group(), re.DOTALL):
-        if not body:
-            raise ValueError(f"No plugin implementation block found for {name}.")
+def _render_signature(parameters: Iterable[tuple[Parameter, Any]], return_annotation: Any) -> str:
+    """
+    Render a signature with a leading positional-only `self`, as `str(Signature)` would.
 
-        extras = list(takewhile(lambda s: not s.startswith("class"), (s for s in body.splitlines() if s)))
+    The parameters are rendered directly instead of building and validating a new `Signature`.
 
-        functions = defaultdict[str, list[WrappedFunction]](list)
+    Args:
+        parameters: The introspected parameters, each with the annotation to render in place of its own.
+        return_annotation: The annotation rendered after `->`, if not `Signature.empty`.
+    """
+    rendered = ["self"]
+    pos_only_separator = True
+    kw_only_separator = True
 
-        for core_like, fbody in plugins_impl_block_pattern.findall(body):
-            for decorator, func_def in func_pattern.findall(fbody):
-                # Normalize the function definition into one stripped line
-                normalized_func = " ".join(func_def.split()).replace("( ", "(").replace(", )", ")")
+    for param, annotation in parameters:
+        kind = param.kind
 
-                # Store functions under the core_like key
-                functions[core_like].append(WrappedFunction(normalized_func, decorator))
+        if kind is Parameter.POSITIONAL_ONLY:
+            pos_only_separator = True
+        elif pos_only_separator:
+            rendered.append("/")
+            pos_only_separator = False
 
-        doc = _extract_description(text, name, functions)
+        if kind is Parameter.VAR_POSITIONAL:
+            kw_only_separator = False
+        elif kind is Parameter.KEYWORD_ONLY and kw_only_separator:
+            rendered.append("*")
+            kw_only_separator = False
 
-        implementations.append(Implementation(name, functions, doc, extras))
+        formatted = param.name
 
-    return implementations
+        if annotation is not Parameter.empty:
+            formatted += ": " + _format_annotation(annotation)
 
+        if param.default is not Parameter.empty:
+            formatted += (" = " if annotation is not Parameter.empty else "=") + repr(param.default)
 
-@cache
-def _search_core_impl(core_name: str, text: str) -> re.Match[str] | None:
-    """Regex to capture the whole plugins bound block"""
-    return re.search(rf"{_CORE_IMPL_START}(.*?){_CORE_IMPL_END}".format(core_name=core_name), text, re.DOTALL)
+        if kind is Parameter.VAR_POSITIONAL:
+            formatted = "*" + formatted
+        elif kind is Parameter.VAR_KEYWORD:
+            formatted = "**" + formatted
 
+        rendered.append(formatted)
 
-def _extract_description(text: str, ns: str, functions: Mapping[str, Sequence[WrappedFunction]]) -> str:
-    core_name = next(iter(functions))
+    if pos_only_separator:
+        rendered.append("/")
 
-    core_impl_matched = _search_core_impl(core_name, text)
+    if return_annotation is Signature.empty:
+        return "(" + ", ".join(rendered) + ")"
 
-    if core_impl_matched is None:
-        raise ValueError(f"No core implementation block found for {core_name}.")
+    return "(" + ", ".join(rendered) + ") -> " + _format_annotation(return_annotation)
 
-    # Regex to capture the attribute block
-    attr_matched = re.search(
-        rf"{_ATTR_IMPL_START}(.*?){_ATTR_IMPL_END}".format(core_name=core_name, name=ns),
-        core_impl_matched.group(0),
-        re.DOTALL,
-    )
-    if not attr_matched:
-        raise ValueError(f"No attribute block found for {core_name}.{ns}.")
 
-    doc_matched = re.search(r"(?:\"\"\"(.*?)\"\"\"|)$", attr_matched.group(1), re.DOTALL)
+def splice_implementations(document: StubDocument, implementations: Sequence[Implementation]) -> str | None:
+    """
+    Re-render in `document` only the implementation blocks whose fingerprint or library key changed.
+
+    Unchanged blocks are copied byte-for-byte.
+    Returns None if the blocks can't be updated in place, i.e. when plugins are added or removed
+    or when a plugin is bound to different cores.
+    """
+    with phase("splice"):
+        return _splice_implementations(document, implementations)
+
+
+def _splice_implementations(document: StubDocument, implementations: Sequence[Implementation]) -> str | None:
+    old_impl = _index_by_namespace(document.implementations)
+    new_impl = _index_by_namespace(implementations)
+
+    if old_impl.keys() != new_impl.keys():
+        return None
+
+    # (start, end, replacement) of each block to replace
+    edits = list[tuple[int, int, str]]()
+
+    for ns, new in new_impl.items():
+        old = old_impl[ns]
+
+        if new.fingerprint is not None and new.fingerprint == old.fingerprint and new.library == old.library:
+            continue
+
+        if new.functions.keys() != old.functions.keys():
+            return None
+
+        if (block := document.index.get(_IMPL_START.format(name=ns))) is None:
+            return None
 
-    return "" if not doc_matched else doc_matched.group(1)
+        edits.append((block.start, block.end, new.as_stub().removesuffix("\n")))
 
+        if new.description == old.description:
+            continue
 
-def write_implementations(implementations: list[Implementation], template: str) -> str:
+        for core_name in new.functions:
+            if (attr := document.attribute(core_name, ns)) is None:
+                return None
+
+            edits.append((attr.start, attr.end, Attribute(ns, core_name, new.description).as_stub().removesuffix("\n")))
+
+    log.debug("Spliced %d block(s) for %d plugin(s)", len(edits), len(new_impl))
+
+    parts = list[str]()
+    pos = 0
+
+    for start, end, replacement in sorted(edits):
+        parts.append(document.text[pos:start])
+        parts.append(replacement)
+        pos = end
+
+    parts.append(document.text[pos:])
+
+    return "".join(parts)
+
+
+def write_stubs(implementations: Sequence[Implementation], template: str) -> str:
+    """
+    Fill the plugin implementations block and the plugin bound blocks of `template` with the given implementations.
+
+    Same as `write_implementations` followed by `write_plugins_bound`, in a single pass over the template.
+    """
+    with phase("render"):
+        return _fill_blocks(
+            template, _implementations_body(implementations) | _plugins_bound_bodies(_get_attributes(implementations))
+        )
+
+
+def write_implementations(implementations: Sequence[Implementation], template: str) -> str:
     """Replace the plugin implementations block in `template` with the given implementations."""
-    body = "\n".join(impl.as_stub() for impl in sorted(implementations))
-    replacement = f"{_PLUGINS_IMPL_START}\n{body}\n{_PLUGINS_IMPL_END}"
-
-    return re.sub(
-        rf"{_PLUGINS_IMPL_START}.*{_PLUGINS_IMPL_END}",
-        replacement,
-        template,
-        flags=re.DOTALL,
-    )
+    return _fill_blocks(template, _implementations_body(implementations))
 
 
-def write_plugins_bound(implementations: list[Implementation], template: str) -> str:
+def write_plugins_bound(implementations: Sequence[Implementation], template: str) -> str:
     """Replace the plugin bound blocks in `template` with the given implementations."""
-    for core_like in _get_cores():
-        cname = core_like.__class__.__name__
-
-        plugins_bound = "\n".join(
-            (
-                f"{_ATTR_IMPL_START.format(core_name=cname, name=i.namespace)}\n"
-                f"    {i.namespace}: Final[_{i.namespace}._{cname}_bound.Plugin]\n"
-                f'    """{i.description}"""\n'
-                f"{_ATTR_IMPL_END.format(core_name=cname, name=i.namespace)}"
-            )
-            for i in sorted(implementations, key=lambda i: i.namespace)
-            if cname in i.functions
-        )
+    return _fill_blocks(template, _plugins_bound_bodies(_get_attributes(implementations)))
+
+
+def stream_stubs(interfaces: Iterable[PluginInterface], template: str, output: IO[str], *, compat: bool) -> None:
+    """
+    Write the stubs of the plugins to `output`, constructing their implementation blocks one at a time.
+
+    The implementation blocks are spooled to a temporary file as the interfaces are consumed
+    and only the attributes of the plugin bound blocks are kept in memory,
+    so `interfaces` can be a generator introspecting the plugins lazily.
+    The output is the same as `write_stubs` as long as `interfaces` is sorted by namespace.
+    """
+    attributes = list[Attribute]()
+    previous = ""
+
+    with tempfile.TemporaryFile("w+") as spool:
+        for interface in interfaces:
+            if interface.namespace <= previous:
+                raise ValueError(f"The plugins aren't sorted by namespace: {interface.namespace} after {previous}.")
+
+            implementation = construct_implementation(interface, compat=compat)
+
+            spool.write(("\n" if previous else "") + implementation.as_stub())
+            attributes.extend(_get_attributes([implementation]))
+
+            previous = interface.namespace
 
-        template = re.sub(
-            rf"{_CORE_IMPL_START}.*{_CORE_IMPL_END}".format(core_name=cname),
-            rf"{_CORE_IMPL_START}\n{plugins_bound}\n{_CORE_IMPL_END}".format(core_name=cname),
-            template,
-            flags=re.DOTALL,
+        bodies = _plugins_bound_bodies(attributes)
+        spool.seek(0)
+
+        for chunk, marker in _split_template(template, [_PLUGINS_IMPL_START, *bodies]):
+            output.write(chunk)
+
+            if marker == _PLUGINS_IMPL_START:
+                shutil.copyfileobj(spool, output)
+                output.write("\n")
+            elif marker is not None:
+                output.write(bodies[marker] + "\n")
+
+
+def _get_attributes(implementations: Iterable[Implementation]) -> list[Attribute]:
+    return [Attribute(i.namespace, core_name, i.description) for i in implementations for core_name in i.functions]
+
+
+def _implementations_body(implementations: Sequence[Implementation]) -> dict[str, str]:
+    return {_PLUGINS_IMPL_START: "\n".join(impl.as_stub() for impl in sorted(implementations))}
+
+
+def _plugins_bound_bodies(attributes: Iterable[Attribute]) -> dict[str, str]:
+    attributes = sorted(attributes)
+
+    return {
+        _CORE_IMPL_START.format(core_name=cname): "\n".join(
+            attr.as_stub().removesuffix("\n") for attr in attributes if attr.core_name == cname
         )
+        for cname in _CORE_NAMES
+    }
+
+
+def _fill_blocks(template: str, bodies: Mapping[str, str]) -> str:
+    """
+    Replace the body of the blocks opened by the markers of `bodies`, keeping their marker lines.
+
+    The output is joined at once, so the cost is linear in the size of the output.
+    """
+    return "".join(
+        chunk + (bodies[marker] + "\n" if marker is not None else "")
+        for chunk, marker in _split_template(template, bodies)
+    )
+
+
+def _split_template(template: str, markers: Iterable[str]) -> list[tuple[str, str | None]]:
+    """
+    Split `template` around the bodies of the blocks opened by `markers`, located with its marker index.
+
+    Each static chunk is paired with the marker of the block whose body follows it, or None for the last chunk.
+    Blocks missing from the template are skipped.
+    """
+    index = parse_stub(template).index
+
+    blocks = sorted(
+        ((block, marker) for marker in markers if (block := index.get(marker)) is not None),
+        key=lambda b: b[0].start,
+    )
+
+    chunks = list[tuple[str, str | None]]()
+    pos = 0
+
+    for block, marker in blocks:
+        chunks.append((template[pos : block.body_start], marker))
+        pos = block.body_end
+
+    chunks.append((template[pos:], None))
 
-    return template
+    return chunks
@@ -1,9 +1,18 @@
+import hashlib
+import json
 import re
 from collections import defaultdict
 from collections.abc import Iterator
+from functools import cache
 from importlib import resources
+from logging import getLogger
 from pathlib import Path
 
+from .profiling import phase
+from .utils import _get_cache_dir, _get_vsstubs_version, _write_text_atomic
+
+log = getLogger(__name__)
+
 _template_filenames = (
     "__all__",
     "_typing",
@@ -67,8 +76,58 @@ def _extract_imports(code: str) -> tuple[defaultdict[str, set[str]], str]:
     return imports, remaining_code
 
 
+def _get_template_key() -> str | None:
+    """
+    Key the merged template on the vsstubs version and the size and mtime of each template file.
+
+    Returns None when the templates aren't plain files, e.g. when the package is imported from a zip.
+    """
+    if not isinstance(root := resources.files("vsstubs").joinpath("_template"), Path):
+        return None
+
+    fields: list[object] = [_get_vsstubs_version()]
+
+    for name in _template_filenames:
+        st = (root / f"{name}.pyi").stat()
+        fields.append([name, st.st_size, st.st_mtime_ns])
+
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()[:32]
+
+
+@cache
+@phase("template")
 def get_template() -> str:
-    """Get the clean and merged template."""
+    """
+    Get the clean and merged template.
+
+    The merged template is stored in the user cache folder on first use,
+    later runs read it back instead of merging the template files again.
+    """
+    if (key := _get_template_key()) is None:
+        return _merge_template()
+
+    path = _get_cache_dir() / "template" / f"{key}.pyi"
+
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        log.debug("Ignoring unreadable cached template %s", path, exc_info=True)
+
+    tmpl = _merge_template()
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_text_atomic(path, tmpl)
+    except OSError:
+        log.debug("Couldn't write the cached template %s", path, exc_info=True)
+
+    return tmpl
+
+
+def _merge_template() -> str:
+    """Merge the template files into a single stub."""
 
     noqa = "# This file is auto-generated. DO NOT EDIT.\n"
     noqa += "# ruff: noqa\n"
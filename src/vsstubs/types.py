@@ -2,23 +2,33 @@ from __future__ import annotations
 
 import collections.abc
 import sys
+from abc import ABC, ABCMeta, abstractmethod
 from collections.abc import Mapping, Sequence
 from functools import cache
-from inspect import Signature
-from types import GenericAlias, NoneType
+from importlib import import_module
+from inspect import Parameter, Signature
+from types import GenericAlias, NoneType, UnionType
 from typing import (
+    TYPE_CHECKING,
     Any,
+    ClassVar,
     NamedTuple,
     Protocol,
+    Self,
+    TypedDict,
     Union,  # pyright: ignore[reportDeprecated]
+    cast,
     get_args,
     get_origin,
+    is_typeddict,
     runtime_checkable,
 )
+from weakref import WeakValueDictionary
 
-from vapoursynth import AudioNode, Core, Func, VideoNode
+from .constants import _ATTR_IMPL_END, _ATTR_IMPL_START, _IMPL_END, _IMPL_START, _IMPL_START_ATTRIBUTES
 
-from .constants import _ATTR_IMPL_END, _ATTR_IMPL_START, _IMPL_END, _IMPL_START
+if TYPE_CHECKING:
+    from vapoursynth import AudioNode, Core, VideoNode
 
 type _CoreLike = Core | VideoNode | AudioNode  # noqa: PYI047
 type _CoreLikeStr = str
@@ -30,6 +40,34 @@ class PluginInterface(NamedTuple):
     namespace: str
     functions: Mapping[_CoreLikeStr, Sequence[FunctionInterface]]
     description: str
+    library: str | None = None
+    """Short key of the library file the plugin was loaded from, see `cache.get_library_key`."""
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the interface into a JSON-compatible dict."""
+        data = {
+            "namespace": self.namespace,
+            "description": self.description,
+            "functions": {core_name: [f.as_dict() for f in funcs] for core_name, funcs in self.functions.items()},
+        }
+
+        if self.library is not None:
+            data["library"] = self.library
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PluginInterface:
+        """Rebuild an interface serialized with `as_dict`."""
+        return cls(
+            data["namespace"],
+            {
+                core_name: [FunctionInterface.from_dict(f) for f in funcs]
+                for core_name, funcs in data["functions"].items()
+            },
+            data["description"],
+            data.get("library"),
+        )
 
 
 class FunctionInterface(NamedTuple):
@@ -38,6 +76,46 @@ class FunctionInterface(NamedTuple):
     name: str
     signature: Signature
 
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the function name and signature into a JSON-compatible dict."""
+        parameters = list[dict[str, Any]]()
+
+        for param in self.signature.parameters.values():
+            dumped: dict[str, Any] = {"name": param.name, "kind": param.kind.name}
+
+            if param.annotation is not Parameter.empty:
+                dumped["annotation"] = _dump_annotation(param.annotation)
+
+            if param.default is not Parameter.empty:
+                if not isinstance(param.default, (NoneType, bool, int, float, str)):
+                    raise TypeError(f"Unserializable default value for {self.name}.{param.name}: {param.default!r}")
+                dumped["default"] = param.default
+
+            parameters.append(dumped)
+
+        data: dict[str, Any] = {"name": self.name, "parameters": parameters}
+
+        if self.signature.return_annotation is not Signature.empty:
+            data["return"] = _dump_annotation(self.signature.return_annotation)
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> FunctionInterface:
+        """Rebuild a function interface serialized with `as_dict`."""
+        parameters = [
+            Parameter(
+                p["name"],
+                getattr(Parameter, p["kind"]),
+                default=p.get("default", Parameter.empty),
+                annotation=_load_annotation(p["annotation"]) if "annotation" in p else Parameter.empty,
+            )
+            for p in data["parameters"]
+        ]
+        return_annotation = _load_annotation(data["return"]) if "return" in data else Signature.empty
+
+        return cls(data["name"], Signature(parameters, return_annotation=return_annotation))
+
 
 class Attribute(NamedTuple):
     """Attribute interfarce."""
@@ -65,10 +143,21 @@ class Implementation(NamedTuple):
     functions: Mapping[_CoreLikeStr, Sequence[WrappedFunction]]
     description: str
     extra_types: Sequence[str] | None = None
+    fingerprint: str | None = None
+    """Fingerprint of the plugin interface this implementation was constructed from."""
+    library: str | None = None
+    """Key of the plugin library file this implementation was constructed from."""
 
     def as_stub(self) -> str:
         indent = " " * 4
-        stub = [_IMPL_START.format(name=self.namespace)]
+        attributes = " ".join(
+            f"{key}={value}" for key, value in (("fingerprint", self.fingerprint), ("library", self.library)) if value
+        )
+        stub = [
+            _IMPL_START_ATTRIBUTES.format(name=self.namespace, attributes=attributes)
+            if attributes
+            else _IMPL_START.format(name=self.namespace)
+        ]
 
         if self.extra_types:
             stub.append("\n".join(self.extra_types))
@@ -90,8 +179,45 @@ class Implementation(NamedTuple):
         return "\n".join(stub) + "\n"
 
 
-class TypeLike:
-    __slots__ = ()
+class TypeLike(ABC):
+    """
+    Base class of the objects standing for a type in the stubs.
+
+    Type-likes are interned: constructing one equal to an existing one returns the existing instance,
+    so the identity-based equality and hash of `object` are value-based and each distinct type is rendered once.
+    An instance is only interned while it's referenced, and pickling or copying it goes through the constructor.
+    """
+
+    __slots__ = ("__weakref__", "_args", "_repr")
+
+    _interned: ClassVar[WeakValueDictionary[tuple[type[TypeLike], tuple[Any, ...]], TypeLike]] = WeakValueDictionary()
+
+    _args: tuple[Any, ...]
+    _repr: str | None
+
+    def __new__(cls, *args: Any) -> Self:
+        key = (cls, args)
+
+        if (interned := TypeLike._interned.get(key)) is not None:
+            return cast(Self, interned)
+
+        self = super().__new__(cls)
+        self._args = args
+        self._repr = None
+
+        return cast(Self, TypeLike._interned.setdefault(key, self))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), self._args
+
+    def __repr__(self) -> str:
+        if self._repr is None:
+            self._repr = self._render()
+
+        return self._repr
+
+    @abstractmethod
+    def _render(self) -> str: ...
 
     @property
     def __name__(self) -> str:
@@ -101,7 +227,7 @@ class TypeLike:
 class AnyStr(TypeLike):
     __slots__ = ()
 
-    def __repr__(self) -> str:
+    def _render(self) -> str:
         return "_AnyStr"
 
 
@@ -110,7 +236,7 @@ class IntLike(TypeLike):
 
     __slots__ = ()
 
-    def __repr__(self) -> str:
+    def _render(self) -> str:
         return "_IntLike"
 
 
@@ -119,7 +245,7 @@ class FloatLike(TypeLike):
 
     __slots__ = ()
 
-    def __repr__(self) -> str:
+    def _render(self) -> str:
         return "_FloatLike"
 
 
@@ -127,7 +253,7 @@ if sys.version_info >= (3, 14):
     UnionLike = Union  # pyright: ignore[reportDeprecated]
 else:
 
-    class UnionTypeLike(type):
+    class UnionTypeLike(ABCMeta):
         def __getitem__(cls, t: tuple[Any, ...]) -> UnionLike:
             return UnionLike(*t)
 
@@ -137,12 +263,13 @@ else:
         Only needed for python <3.14, see <https://docs.python.org/3/whatsnew/3.14.html#typing>
         """
 
-        __slots__ = ("__args__",)
+        __slots__ = ()
 
-        def __init__(self, *t: Any) -> None:
-            self.__args__ = t
+        @property
+        def __args__(self) -> tuple[Any, ...]:
+            return self._args
 
-        def __repr__(self) -> str:
+        def _render(self) -> str:
             repr_types = list[str]()
 
             for t in self.__args__:
@@ -162,38 +289,46 @@ else:
 class VSCallbackTypeLike(TypeLike):
     """Type-like to represent a VSCallback."""
 
-    __slots__ = ("repr",)
+    __slots__ = ()
 
-    def __init__(self, repr: str = "_VSCallback") -> None:
-        self.repr = repr
+    def __new__(cls, repr: str = "_VSCallback") -> Self:
+        return super().__new__(cls, repr)
 
-    def __repr__(self) -> str:
-        return self.repr
+    def _render(self) -> str:
+        return self._args[0]
 
 
 class VideoNodeType(TypeLike):
-    def __repr__(self) -> str:
+    __slots__ = ()
+
+    def _render(self) -> str:
         return "VideoNode"
 
 
 class AudioNodeType(TypeLike):
-    def __repr__(self) -> str:
+    __slots__ = ()
+
+    def _render(self) -> str:
         return "AudioNode"
 
 
 class SequenceLike(TypeLike):
-    __slots__ = ("_args", "repr")
+    __slots__ = ()
 
-    def __init__(self, args: Sequence[Any]) -> None:
-        self._args = args
-        self.repr = "_SequenceLike"
+    def __new__(cls, args: Sequence[Any]) -> Self:
+        return super().__new__(cls, *args)
 
-    def __repr__(self) -> str:
-        return self.repr + "[" + ", ".join(ta.__name__ for ta in self._args) + "]"
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (self._args,)
+
+    def _render(self) -> str:
+        return "_SequenceLike[" + ", ".join(ta.__name__ for ta in self._args) + "]"
 
 
 @cache
 def parse_type(utype: Any, is_return: bool = False) -> Any:
+    from vapoursynth import AudioNode, Func, VideoNode
+
     if utype is int:
         return IntLike()
 
@@ -236,6 +371,87 @@ def parse_type(utype: Any, is_return: bool = False) -> Any:
     return GenericAlias(origin, parsed)
 
 
+# Modules whose objects can be referenced by name in a serialized annotation.
+_SERIALIZABLE_MODULES = frozenset({"builtins", "collections.abc", "types", "typing", "vapoursynth"})
+
+
+def _dump_annotation(annotation: Any) -> Any:
+    """Encode an annotation as returned by `vs.Function.__signature__` into JSON-compatible data."""
+    if annotation is None:
+        return None
+
+    if annotation is NoneType:
+        return {"ref": ["types", "NoneType"]}
+
+    if annotation is Any:
+        return {"ref": ["typing", "Any"]}
+
+    if annotation is Ellipsis:
+        return {"ref": ["builtins", "Ellipsis"]}
+
+    # Callable arguments
+    if isinstance(annotation, list):
+        return {"list": [_dump_annotation(arg) for arg in annotation]}
+
+    if is_typeddict(annotation):
+        return {
+            "typeddict": annotation.__name__,
+            "module": annotation.__module__,
+            "fields": {k: _dump_annotation(v) for k, v in annotation.__annotations__.items()},
+        }
+
+    if (origin := get_origin(annotation)) is not None:
+        args = [_dump_annotation(arg) for arg in get_args(annotation)]
+
+        if origin is Union or origin is UnionType:  # pyright: ignore[reportDeprecated]
+            return {"union": args}
+
+        return {"origin": _dump_annotation(origin), "args": args}
+
+    if isinstance(annotation, type) and annotation.__module__ in _SERIALIZABLE_MODULES:
+        return {"ref": [annotation.__module__, annotation.__qualname__]}
+
+    raise TypeError(f"Unserializable annotation: {annotation!r}")
+
+
+def _load_annotation(data: Any) -> Any:
+    """Decode an annotation encoded by `_dump_annotation`."""
+    if data is None:
+        return None
+
+    if "ref" in data:
+        module, qualname = data["ref"]
+
+        if module not in _SERIALIZABLE_MODULES:
+            raise ValueError(f"Refusing to load an annotation from the module {module!r}.")
+
+        obj: Any = import_module(module)
+
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+
+        return obj
+
+    if "list" in data:
+        return [_load_annotation(arg) for arg in data["list"]]
+
+    if "typeddict" in data:
+        td = TypedDict(data["typeddict"], {k: _load_annotation(v) for k, v in data["fields"].items()})  # type: ignore[misc]
+        # Keep the original module so the annotation renders the same way.
+        td.__module__ = data["module"]
+        return td
+
+    if "union" in data:
+        members = tuple(_load_annotation(arg) for arg in data["union"])
+        return Union[members]  # pyright: ignore[reportDeprecated]  # noqa: UP007
+
+    if "origin" in data:
+        args = tuple(_load_annotation(arg) for arg in data["args"])
+        return _load_annotation(data["origin"])[args]
+
+    raise ValueError(f"Unknown serialized annotation: {data!r}")
+
+
 @runtime_checkable
 class HasNameSpace(Protocol):
     @property
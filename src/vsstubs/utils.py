@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import filecmp
+import os
 import site
+import stat
 import sys
+import tempfile
 import threading
-from collections.abc import Callable, Iterable, Sequence
-from functools import cache, wraps
+from collections.abc import Callable, Iterable
+from functools import cache
 from inspect import Parameter
 from pathlib import Path
-from typing import Any, cast
-
-from vapoursynth import GRAY8, Plugin, core, register_on_destroy
+from typing import IO, Any
 
 from .constants import _VSCALLBACK_SIGNATURE
 from .types import (
@@ -18,7 +20,6 @@ from .types import (
     PluginInterface,
     UnionLike,
     VSCallbackTypeLike,
-    _CoreLike,
     parse_type,
 )
 
@@ -77,43 +78,171 @@ def _get_default_stubs_path() -> Path:
 
 
 @cache
-def _get_plugins() -> Sequence[Plugin]:
-    return tuple(core.plugins())
+def _get_cache_dir() -> Path:
+    if cache_dir := os.environ.get("VSSTUBS_CACHE_DIR"):
+        return Path(cache_dir)
+
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+
+    return base / "vsstubs"
 
 
 @cache
-def _get_dir(has_dir: Any) -> list[str]:
-    return dir(has_dir)
+def _get_vsstubs_version() -> str:
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("vsstubs")
+    except importlib.metadata.PackageNotFoundError:
+        return "0.0.0+unknown"
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """Write `text` to a temporary file next to `path` and move it in place."""
+    _write_atomic(path, lambda f: f.write(text))
+
+
+def _write_stream_if_changed(path: Path, write: Callable[[IO[str]], object]) -> bool:
+    """
+    Atomically write to `path` the text that `write` writes to the file it's given,
+    unless `path` already holds the same content.
+
+    The text isn't held in memory as a whole, it's compared with the current content once written next to `path`.
+
+    Returns:
+        True if the file was written, False if it was left untouched.
+    """
+    return _write_atomic(path, write, if_changed=True)
+
+
+def _write_atomic(path: Path, write: Callable[[IO[str]], object], *, if_changed: bool = False) -> bool:
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        # mkstemp creates the file readable by its owner only, apply the usual permissions instead.
+        mode = _get_new_file_mode(path.parent)
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            write(f)
+
+        if if_changed and path.is_file() and filecmp.cmp(tmp, path, shallow=False):
+            Path(tmp).unlink()
+            return False
+
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    return True
+
+
+def _write_text_if_changed(path: Path, text: str) -> bool:
+    """
+    Atomically write `text` to `path` unless the file already holds the same content.
+
+    Returns:
+        True if the file was written, False if it was left untouched.
+    """
+    try:
+        if path.read_text() == text:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    _write_text_atomic(path, text)
+    return True
+
+
+def _get_new_file_mode(folder: Path) -> int:
+    """The permissions of a file created in `folder`, from the umask or else from the files already there."""
+    if (umask := _get_umask()) is not None:
+        return 0o666 & ~umask
+
+    for sibling in folder.iterdir():
+        # Skipping the temporary files of the other writes
+        if not sibling.name.startswith(".") and sibling.is_file():
+            return stat.S_IMODE(sibling.stat().st_mode)
+
+    # With the usual umask of 022
+    return 0o644
 
 
 @cache
-def _get_cores() -> Sequence[_CoreLike]:
-    return [
-        core.core,
-        core.std.BlankClip(None, 1, 1, GRAY8, 1, 1, 1, 0, True),
-        core.std.BlankAudio(None, length=1, keep=True),
-    ]
+def _get_umask() -> int | None:
+    """
+    Read the umask of the process from `/proc/self/status` on Linux, None elsewhere.
+
+    `os.umask` can only read it by setting it, which changes it for the files created by the other threads meanwhile.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+
+    return None
+
+
+# The environment policy is registered for the whole process, whatever the generation context.
+_AUTOLOADING_DISABLED = False
+_LOCK_AUTOLOADING = threading.Lock()
+
+
+def _disable_autoloading() -> None:
+    """
+    Give this process a core that doesn't autoload the installed plugins.
+
+    Only the plugins built into VapourSynth are available until others are loaded explicitly.
+    Must be called before the core is used for the first time.
+    """
+    global _AUTOLOADING_DISABLED
+
+    from vapoursynth import (
+        DISABLE_AUTO_LOADING,
+        EnvironmentData,
+        EnvironmentPolicy,
+        EnvironmentPolicyAPI,
+        has_policy,
+        register_policy,
+    )
+
+    # Same as the StandaloneEnvironmentPolicy registered by default, with the autoloading disabled
+    class NoAutoloadingPolicy(EnvironmentPolicy):
+        _environment: EnvironmentData | None
 
+        def on_policy_registered(self, special_api: EnvironmentPolicyAPI) -> None:
+            self._environment = special_api.create_environment(DISABLE_AUTO_LOADING)
 
-_REGISTERED = False
-_LOCK_REGISTER = threading.Lock()
+        def on_policy_cleared(self) -> None:
+            self._environment = None
 
+        def get_current_environment(self) -> EnvironmentData | None:
+            return self._environment
 
-def register_destroy_cbs[F: Callable[..., Any]]() -> Callable[[F], F]:
-    def decorator(func: F) -> F:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            global _REGISTERED
+        def set_environment(self, environment: EnvironmentData | None) -> EnvironmentData | None:
+            return self._environment
 
-            with _LOCK_REGISTER:
-                if not _REGISTERED:
-                    register_on_destroy(_get_plugins.cache_clear)
-                    register_on_destroy(_get_dir.cache_clear)
-                    register_on_destroy(_get_cores.cache_clear)
-                    _REGISTERED = True
+        def is_alive(self, environment: EnvironmentData) -> bool:
+            return environment is self._environment
 
-            return func(*args, **kwargs)
+    with _LOCK_AUTOLOADING:
+        if _AUTOLOADING_DISABLED:
+            return
 
-        return cast(F, wrapper)
+        if has_policy():
+            raise ValueError("Plugin autoloading can't be disabled once the VapourSynth core has been created.")
 
-    return decorator
+        register_policy(NoAutoloadingPolicy())
+        _AUTOLOADING_DISABLED = True
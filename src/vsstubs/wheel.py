@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+from .utils import _get_vsstubs_version
+
+_DIST_NAME = "vapoursynth-stubs"
+_PACKAGE_DIR = "vapoursynth-stubs"
+
+# Fixed timestamp so identical stubs give byte-identical archives
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_METADATA = """\
+Metadata-Version: 2.1
+Name: {name}
+Version: {version}
+Summary: Typing stubs for VapourSynth
+"""
+
+_WHEEL = """\
+Wheel-Version: 1.0
+Generator: vsstubs {generator}
+Root-Is-Purelib: true
+Tag: py3-none-any
+"""
+
+
+def _record_hash(data: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+    return f"sha256={digest}"
+
+
+def get_wheel_version(tmpl: str) -> str:
+    """
+    Derive the wheel version from the vsstubs version and the content of the stubs.
+
+    The sha256 of `tmpl` is used as the local version label so identical stubs always get the same version.
+    """
+    import packaging.version
+
+    v = packaging.version.parse(_get_vsstubs_version())
+    digest = hashlib.sha256(tmpl.encode()).hexdigest()
+
+    return f"{v.base_version}+{digest[:16]}"
+
+
+def get_wheel_name(version: str) -> str:
+    return f"{_DIST_NAME.replace('-', '_')}-{version}-py3-none-any.whl"
+
+
+def write_wheel(path: Path, tmpl: str, version: str) -> Path:
+    """
+    Write a `vapoursynth-stubs` wheel containing `tmpl` as `__init__.pyi` into the directory `path`.
+
+    The archive is assembled in-process and moved into place once complete.
+
+    Returns:
+        The path of the wheel.
+    """
+    dist_info = f"{_DIST_NAME.replace('-', '_')}-{version}.dist-info"
+
+    files = {
+        f"{_PACKAGE_DIR}/__init__.pyi": tmpl.encode(),
+        f"{dist_info}/METADATA": _METADATA.format(name=_DIST_NAME, version=version).encode(),
+        f"{dist_info}/WHEEL": _WHEEL.format(generator=_get_vsstubs_version()).encode(),
+    }
+
+    record = "".join(f"{name},{_record_hash(data)},{len(data)}\n" for name, data in files.items())
+    files[f"{dist_info}/RECORD"] = (record + f"{dist_info}/RECORD,,\n").encode()
+
+    path.mkdir(parents=True, exist_ok=True)
+    wheel_path = path / get_wheel_name(version)
+
+    fd, tmp = tempfile.mkstemp(dir=path, prefix=f".{wheel_path.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in files.items():
+                info = zipfile.ZipInfo(name, _ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                zf.writestr(info, data)
+
+        os.replace(tmp, wheel_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    return wheel_path
+
+
+def prune_wheels(path: Path, keep: Path) -> list[Path]:
+    """
+    Delete the `vapoursynth-stubs` wheels of the directory `path` other than `keep`.
+
+    Returns:
+        The paths of the deleted wheels.
+    """
+    pruned = list[Path]()
+
+    for wheel_path in path.glob(get_wheel_name("*")):
+        if wheel_path != keep:
+            wheel_path.unlink(missing_ok=True)
+            pruned.append(wheel_path)
+
+    return pruned
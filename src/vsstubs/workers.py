@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from functools import cache
+from logging import getLogger
+from multiprocessing.connection import Connection, wait
+from os import PathLike
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .constants import DEFAULT_PLUGIN_TIMEOUT
+from .profiling import record_library
+from .types import PluginInterface
+
+if TYPE_CHECKING:
+    from multiprocessing.context import SpawnContext, SpawnProcess
+
+    from .context import GenerationContext
+
+log = getLogger(__name__)
+
+# Task introspecting the plugins built into VapourSynth
+_BUILTINS = "<builtins>"
+
+if sys.platform == "win32":
+    _LIBRARY_SUFFIX = ".dll"
+elif sys.platform == "darwin":
+    _LIBRARY_SUFFIX = ".dylib"
+else:
+    _LIBRARY_SUFFIX = ".so"
+
+
+class IntrospectionResult(NamedTuple):
+    """Plugins introspected by the worker processes."""
+
+    plugins: Sequence[PluginInterface]
+    """Interfaces of the introspected plugins, sorted by namespace."""
+    loaded: frozenset[str]
+    """Namespaces of the plugins loaded from the given paths."""
+    skipped: Mapping[str, str]
+    """Reason for each library file that couldn't be introspected."""
+
+
+def introspect_plugins(
+    paths: Iterable[str | PathLike[str]] = (),
+    *,
+    autoload: bool = True,
+    jobs: int = 1,
+    timeout: float = DEFAULT_PLUGIN_TIMEOUT,
+) -> IntrospectionResult:
+    """
+    Introspect the plugins in worker processes, each with its own core that doesn't autoload plugins.
+
+    The library files are handed one at a time to `jobs` workers.
+    A worker that crashes or spends more than `timeout` seconds on a library is killed and replaced,
+    and the library is reported as skipped.
+
+    Args:
+        paths: Plugin folders or library files to load, as with `load_plugins`.
+        autoload: Also introspect the plugins autoloaded by VapourSynth.
+            Their library files are listed from the VapourSynth plugin folders without being loaded,
+            then handed to the workers like the given ones.
+        jobs: Number of worker processes.
+        timeout: Seconds allowed to load and introspect a single library file.
+    """
+    ctx = multiprocessing.get_context("spawn")
+
+    libraries = _expand_libraries(paths)
+    # The autoloaded libraries are sharded like the given ones, which take precedence in `_merge_results`.
+    autoloaded = _expand_libraries(_autoload_dirs()) if autoload else []
+
+    pending = deque(dict.fromkeys([_BUILTINS, *libraries, *autoloaded]))
+    results = dict[str, list[dict[str, Any]]]()
+    skipped = dict[str, str]()
+
+    workers = list[_Worker]()
+
+    def retire(worker: _Worker, reason: str | None) -> None:
+        if worker.task is not None and reason is not None:
+            record_library(worker.task, "worker", time.monotonic() - worker.started)
+            skipped[worker.task] = reason
+            log.debug("Skipping %s: %s", worker.task, reason)
+
+        worker.kill()
+        workers.remove(worker)
+
+    try:
+        while True:
+            idle = [w for w in workers if w.task is None]
+
+            for _ in range(min(jobs - len(workers), len(pending) - len(idle))):
+                workers.append(_Worker(ctx))
+
+            for w in idle:
+                if w.ready and pending:
+                    w.assign(pending.popleft())
+
+            if not pending and not any(w.task is not None for w in workers):
+                break
+
+            deadlines = [w.started + timeout for w in workers if w.task is not None]
+
+            wait(
+                [w.conn for w in workers] + [w.process.sentinel for w in workers],
+                max(0.0, min(deadlines) - time.monotonic()) if deadlines else None,
+            )
+
+            for w in list(workers):
+                try:
+                    message = w.conn.recv() if w.conn.poll() else None
+                except (EOFError, OSError):
+                    message = None
+
+                if message is not None:
+                    if not w.ready:
+                        w.ready = True
+                        continue
+
+                    plugins, error = message
+
+                    if plugins:
+                        results[w.task] = plugins
+                    if error:
+                        skipped[w.task] = error
+
+                    record_library(w.task, "worker", time.monotonic() - w.started)
+                    w.task = None
+                elif not w.process.is_alive():
+                    if not w.ready:
+                        raise RuntimeError(f"An introspection worker exited with code {w.process.exitcode}.")
+
+                    retire(w, f"The worker process crashed with exit code {w.process.exitcode}")
+                elif w.task is not None and time.monotonic() - w.started > timeout:
+                    retire(w, f"Timed out after {timeout:g} seconds")
+    finally:
+        for w in workers:
+            w.close()
+
+    return _merge_results([_BUILTINS, *libraries], results, skipped)
+
+
+def _expand_libraries(paths: Iterable[str | PathLike[str]]) -> list[str]:
+    libraries = list[str]()
+
+    for path in map(Path, paths):
+        if not path.exists():
+            raise ValueError(f'This path "{path}" doesn\'t exist.')
+
+        if path.is_dir():
+            libraries.extend(
+                sorted(str(p.resolve()) for p in path.iterdir() if p.suffix.lower() == _LIBRARY_SUFFIX and p.is_file())
+            )
+        else:
+            libraries.append(str(path.resolve()))
+
+    return list(dict.fromkeys(libraries))
+
+
+def _autoload_dirs() -> list[Path]:
+    """
+    The folders VapourSynth autoloads plugins from, found without creating a core.
+
+    These are the user and system folders of `vapoursynth.conf` (or the folder of the installation when unset)
+    and, on Windows, the user folder in `%APPDATA%`.
+    """
+    dirs = list[Path]()
+
+    if sys.platform == "win32":
+        if appdata := os.environ.get("APPDATA"):
+            dirs.append(Path(appdata, "VapourSynth", "plugins64"))
+
+        if plugin_dir := _get_plugin_dir():
+            dirs.append(Path(plugin_dir))
+    else:
+        settings = _read_vs_config()
+
+        if settings.get("AutoloadUserPluginDir") != "false" and (user_dir := settings.get("UserPluginDir")):
+            dirs.append(Path(user_dir))
+
+        if settings.get("AutoloadSystemPluginDir") != "false" and (
+            system_dir := settings.get("SystemPluginDir", _get_plugin_dir())
+        ):
+            dirs.append(Path(system_dir))
+
+    return [d for d in dict.fromkeys(dirs) if d.is_dir()]
+
+
+def _read_vs_config() -> dict[str, str]:
+    """The settings of the `vapoursynth.conf` file read by the core, as `key=value` lines."""
+    if sys.platform == "darwin":
+        config = Path.home() / "Library" / "Application Support" / "VapourSynth" / "vapoursynth.conf"
+    else:
+        config = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "vapoursynth" / "vapoursynth.conf"
+
+    try:
+        lines = config.read_text("utf-8").splitlines()
+    except OSError:
+        return {}
+
+    return {
+        key.strip(): value.strip()
+        for key, sep, value in (line.partition("=") for line in lines)
+        if sep and not key.lstrip().startswith("#")
+    }
+
+
+@cache
+def _get_plugin_dir() -> str | None:
+    """The plugin folder of the VapourSynth installation, as printed by `python -m vapoursynth get-plugin-dir`."""
+    try:
+        process = subprocess.run(
+            [sys.executable, "-m", "vapoursynth", "get-plugin-dir"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    return process.stdout.strip() or None
+
+
+def _merge_results(
+    explicit: Sequence[str], results: Mapping[str, list[dict[str, Any]]], skipped: Mapping[str, str]
+) -> IntrospectionResult:
+    """Merge the results in a fixed order: builtins, explicit libraries, then the autoloaded ones by path."""
+    plugins = dict[str, PluginInterface]()
+    providers = dict[str, str]()
+    loaded = set[str]()
+    skipped = dict(skipped)
+
+    for library in [*explicit, *sorted(results.keys() - set(explicit))]:
+        for data in results.get(library, []):
+            pinter = PluginInterface.from_dict(data)
+
+            if (provider := providers.get(pinter.namespace)) is not None:
+                skipped[library] = f'Namespace "{pinter.namespace}" is already provided by {provider}'
+                continue
+
+            plugins[pinter.namespace] = pinter
+            providers[pinter.namespace] = library
+
+            if library in explicit and library != _BUILTINS:
+                loaded.add(pinter.namespace)
+
+    return IntrospectionResult(
+        tuple(plugins[ns] for ns in sorted(plugins)), frozenset(loaded), dict(sorted(skipped.items()))
+    )
+
+
+class _Worker:
+    def __init__(self, ctx: SpawnContext) -> None:
+        self.conn, child = ctx.Pipe()
+        self.process: SpawnProcess = ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+        self.ready = False
+        self.task: str | None = None
+        self.started = 0.0
+
+    def assign(self, task: str) -> None:
+        self.task = task
+        self.started = time.monotonic()
+        self.conn.send(task)
+
+    def close(self) -> None:
+        if self.process.is_alive() and self.task is None:
+            with contextlib.suppress(OSError):
+                self.conn.send(None)
+            self.process.join(1)
+
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def _worker_main(conn: Connection) -> None:
+    from .context import GenerationContext
+    from .utils import _disable_autoloading
+
+    _disable_autoloading()
+    context = GenerationContext()
+
+    conn.send(True)
+
+    while (task := conn.recv()) is not None:
+        try:
+            conn.send(_introspect_library(context, task))
+        except Exception as e:  # noqa: BLE001
+            conn.send(([], f"{type(e).__name__}: {e}"))
+
+
+def _introspect_library(context: GenerationContext, library: str) -> tuple[list[dict[str, Any]], str | None]:
+    """Load a library and serialize the interfaces of the plugins it added, one plugin at a time."""
+    from .stubs import retrieve_plugin
+
+    before = set[str]()
+
+    if library != _BUILTINS:
+        before = {p.namespace for p in context.plugins()}
+
+        context.core.std.LoadPlugin(library)
+
+        # The plugins and the namespaces bound to each core-like changed.
+        context.clear_plugins()
+
+    plugins = list[dict[str, Any]]()
+    errors = list[str]()
+
+    for plugin in context.plugins():
+        if plugin.namespace in before:
+            continue
+
+        try:
+            plugins.append(retrieve_plugin(plugin, context.cores(), context=context).as_dict())
+        except TypeError as e:
+            errors.append(f'The signatures of "{plugin.namespace}" can\'t be serialized: {e}')
+
+    return plugins, "; ".join(errors) or None
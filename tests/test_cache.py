@@ -0,0 +1,65 @@
+from inspect import Parameter, Signature
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+from vapoursynth import VideoNode
+
+from vsstubs import cache
+from vsstubs.cache import get_library_key, get_plugin_key, read_cached_plugin, write_cached_plugin
+from vsstubs.types import FunctionInterface, PluginInterface
+
+
+def _fake_plugin(path: Path) -> Any:
+    return SimpleNamespace(namespace="foo", identifier="com.example.foo", plugin_path=str(path))
+
+
+def test_plugin_key_changes_with_library(tmp_path: Path) -> None:
+    lib = tmp_path / "libfoo.so"
+    lib.write_bytes(b"a")
+    key = get_plugin_key(_fake_plugin(lib))
+
+    assert get_plugin_key(_fake_plugin(lib)) == key
+
+    lib.write_bytes(b"ab")
+    assert get_plugin_key(_fake_plugin(lib)) != key
+
+
+def test_library_key_depends_on_content(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture) -> None:
+    monkeypatch.setattr(cache, "_digests", None)
+    mocker.patch("vsstubs.cache._get_cache_dir", return_value=tmp_path / "cache")
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    lib, reinstalled = tmp_path / "a" / "libfoo.so", tmp_path / "b" / "libfoo.so"
+    lib.write_bytes(b"a")
+    reinstalled.write_bytes(b"a")
+    key = get_library_key(_fake_plugin(lib))
+
+    # Same build installed elsewhere
+    assert get_library_key(_fake_plugin(reinstalled)) == key
+
+    # The digest is read from the cache directory until the file changes
+    file_digest = mocker.spy(cache.hashlib, "file_digest")
+    monkeypatch.setattr(cache, "_digests", None)
+    assert get_library_key(_fake_plugin(lib)) == key
+    assert file_digest.call_count == 0
+
+    lib.write_bytes(b"b")
+    assert get_library_key(_fake_plugin(lib)) != key
+
+
+def test_cached_plugin_roundtrip(tmp_path: Path) -> None:
+    sig = Signature(
+        [Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode)], return_annotation=VideoNode
+    )
+    pinter = PluginInterface("foo", {"VideoNode": [FunctionInterface("Bar", sig)]}, "Foo plugin")
+
+    assert read_cached_plugin(tmp_path, "foo", "key") is None
+
+    write_cached_plugin(tmp_path, "key", pinter)
+
+    assert read_cached_plugin(tmp_path, "foo", "key") == pinter
+    assert read_cached_plugin(tmp_path, "foo", "other key") is None
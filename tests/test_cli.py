@@ -1,3 +1,8 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from pytest_mock import MockerFixture
 
@@ -46,3 +51,70 @@ def test_cli_plugins_json(capsys: pytest.CaptureFixture[str]) -> None:
     assert exc_info.value.code == 0
     captured = capsys.readouterr()
     assert "namespace" in captured.out
+
+
+def test_cli_update_json(mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    mocker.patch("vsstubs.cli.output_stubs", return_value={"path": "out.pyi", "status": "unchanged"})
+
+    with pytest.raises(SystemExit) as exc_info:
+        app.meta(["update", "-i", "out.pyi", "--json"])
+    assert exc_info.value.code == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {"path": "out.pyi", "status": "unchanged"}
+
+
+# Import time allowed for the modules of vsstubs, as a multiple of the imports of a bare interpreter start
+_IMPORT_BUDGET = 10
+
+_STUB = """
+# <plugins/implementations>
+
+# <implementation/std>
+
+class _std:
+    class _VideoNode_bound:
+        class Plugin(_VSPlugin):
+            @_Wrapper.Function
+            def Blur(self, clip: VideoNode, radius: _IntLike = 1) -> VideoNode: ...
+
+# </implementation/std>
+
+# </plugins/implementations>
+
+# <plugins/bound/VideoNode>
+# <attribute/VideoNode_bound/std>
+    std: Final[_std._VideoNode_bound.Plugin]
+    \"\"\"Standard plugins\"\"\"
+# </attribute/VideoNode_bound/std>
+# </plugins/bound/VideoNode>
+"""
+
+
+def _import_times(*args: str) -> tuple[str, dict[str, int]]:
+    """Run the interpreter with `-X importtime` and return its output and the self import time of each module."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True)
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    timings = {
+        name.strip(): int(us.removeprefix("import time:"))
+        for us, cumulative, name in (line.split("|") for line in proc.stderr.splitlines() if "|" in line)
+        if cumulative.strip().isdigit()
+    }
+
+    return proc.stdout, timings
+
+
+def test_cli_import_time(tmp_path: Path) -> None:
+    # Text-only commands like `plugins -i` must not pay for VapourSynth and the introspection machinery.
+    fixture = tmp_path / "stubs.pyi"
+    fixture.write_text(_STUB)
+
+    out, timings = _import_times("-m", "vsstubs", "plugins", "--json", "-i", str(fixture))
+    _, bare = _import_times("-c", "pass")
+
+    assert json.loads(out) == [{"namespace": "std", "description": "Standard plugins"}]
+    assert not {"vapoursynth", "vsstubs.stubs", "vsstubs.workers"} & timings.keys()
+
+    # Third-party packages such as cyclopts and rich aren't accounted for.
+    own = sum(us for name, us in timings.items() if name.partition(".")[0] == "vsstubs")
+    assert own < _IMPORT_BUDGET * sum(bare.values())
@@ -0,0 +1,70 @@
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from pytest_mock import MockerFixture
+from rich.console import Console
+
+from vsstubs.context import GenerationContext, get_default_context, shares_core
+from vsstubs.func import check_stubs
+
+
+def test_context_caches() -> None:
+    context = GenerationContext()
+    has_dir = object()
+
+    names = context.dir(has_dir)
+    assert context.dir(has_dir) is names
+
+    context.clear_plugins()
+    assert context.dir(has_dir) is not names
+
+    assert get_default_context() is get_default_context()
+
+
+def test_concurrent_checks(mocker: MockerFixture) -> None:
+    mocker.patch("vsstubs.func.get_implementations_from_input", return_value=[])
+
+    contexts = [GenerationContext(Console(file=StringIO())) for _ in range(8)]
+
+    for i, context in enumerate(contexts):
+        mocker.patch.object(context, "plugins", return_value=[SimpleNamespace(namespace=f"plugin{i}")])
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(
+            executor.map(lambda context: check_stubs(StringIO(""), stop_early=True, context=context), contexts)
+        )
+
+    for i, (context, result) in enumerate(zip(contexts, results, strict=True)):
+        assert result["new"] == [f"plugin{i}"]
+        assert context.console.file.getvalue() == f"New plugin(s) to be added: plugin{i}\n"
+
+
+def test_concurrent_runs_load_the_same_plugins(tmp_path: Path) -> None:
+    started, finish = threading.Event(), threading.Event()
+
+    @shares_core
+    def run(load: Sequence[Path] | None = None, *, wait: bool = False) -> None:
+        if wait:
+            started.set()
+            finish.wait()
+
+    with ThreadPoolExecutor(1) as executor:
+        running = executor.submit(run, [tmp_path / "a.so"], wait=True)
+        started.wait()
+
+        run([tmp_path / "a.so"])
+
+        with pytest.raises(ValueError, match="every generation context shares"):
+            run([tmp_path / "b.so"])
+        with pytest.raises(ValueError, match="every generation context shares"):
+            run()
+
+        finish.set()
+        running.result()
+
+    run([tmp_path / "b.so"])
@@ -0,0 +1,75 @@
+from vsstubs.constants import _ATTR_IMPL_START, _CORE_IMPL_START, _IMPL_START, _PLUGINS_IMPL_START
+from vsstubs.document import MarkerIndex, StubDocument, parse_stub
+
+_TEXT = """\
+# <plugins/bound/VideoNode>
+# <attribute/VideoNode_bound/std>
+    std: Final[_std._VideoNode_bound.Plugin]
+# </attribute/VideoNode_bound/std>
+# </plugins/bound/VideoNode>
+
+# <plugins/implementations>
+# <implementation/akarin>
+class _akarin: ...
+# </implementation/akarin>
+
+# <implementation/std>
+class _std: ...
+# </implementation/std>
+# </plugins/implementations>
+"""
+
+
+def test_marker_index_blocks() -> None:
+    index = MarkerIndex(_TEXT)
+
+    assert _PLUGINS_IMPL_START in index
+    assert _CORE_IMPL_START.format(core_name="Core") not in index
+
+    assert index.body(_IMPL_START.format(name="std")) == "class _std: ...\n"
+    assert index.body(_ATTR_IMPL_START.format(core_name="VideoNode", name="std")) == (
+        "    std: Final[_std._VideoNode_bound.Plugin]\n"
+    )
+
+    block = index.get(_IMPL_START.format(name="akarin"))
+    assert block is not None
+    assert _TEXT[block.start : block.end] == "# <implementation/akarin>\nclass _akarin: ...\n# </implementation/akarin>"
+
+
+def test_marker_index_children() -> None:
+    index = MarkerIndex(_TEXT)
+
+    assert [b.name for b in index.children(_PLUGINS_IMPL_START)] == ["implementation/akarin", "implementation/std"]
+    assert [b.name for b in index.children(_CORE_IMPL_START.format(core_name="VideoNode"))] == [
+        "attribute/VideoNode_bound/std"
+    ]
+
+
+def test_marker_index_unbalanced() -> None:
+    index = MarkerIndex("# <a>\n# <b>\n# </a>\n# </c>\n")
+
+    assert index.body("# <a>") == "# <b>\n"
+    assert "# <b>" not in index
+    assert "# <c>" not in index
+
+
+def test_stub_document_description() -> None:
+    doc = StubDocument(_TEXT.replace("    std: Final", '    """Standard plugins"""\n    std: Final'))
+
+    assert doc.attribute("VideoNode", "std") is not None
+    assert doc.attribute("VideoNode", "akarin") is None
+    assert doc.description("VideoNode", "std") == "Standard plugins"
+
+
+def test_parse_stub_is_bounded() -> None:
+    parse_stub.cache_clear()
+
+    for i in range(1000):
+        parse_stub(f"# <plugins/implementations>\n# </plugins/implementations>\n# {i}\n")
+
+    assert parse_stub(_TEXT) is parse_stub(_TEXT)
+
+    info = parse_stub.cache_info()
+    assert info.maxsize is not None
+    assert info.currsize <= info.maxsize
+    assert info.hits == 1
@@ -0,0 +1,136 @@
+from inspect import Parameter, Signature
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+from pytest_mock import MockerFixture
+from vapoursynth import VideoNode
+
+from vsstubs import stubs
+from vsstubs.constants import DEFAULT_PLUGIN_TIMEOUT
+from vsstubs.context import GenerationContext
+from vsstubs.func import _diff_plugins, check_stubs, list_plugins, output_stubs
+from vsstubs.types import FunctionInterface, Implementation, PluginInterface, WrappedFunction
+
+
+def test_diff_plugins() -> None:
+    old = Implementation(
+        "foo",
+        {
+            "Core": [
+                WrappedFunction("Bar(self, /, x: int) -> VideoNode: ..."),
+                WrappedFunction("Old(self, /) -> None: ..."),
+            ],
+            "VideoNode": [WrappedFunction("Bar(self, /) -> VideoNode: ...")],
+        },
+        "Foo",
+    )
+    new = Implementation(
+        "foo",
+        {
+            "Core": [
+                WrappedFunction("New(self, /) -> None: ..."),
+                WrappedFunction("Bar(self, /, y: int) -> VideoNode: ..."),
+            ],
+            "VideoNode": [WrappedFunction("Bar(self, /) -> VideoNode: ...")],
+        },
+        "Foo plugin",
+    )
+
+    assert _diff_plugins(old, old) == {}
+    assert _diff_plugins(old, new) == {
+        "functions": {
+            "Core": {
+                "added": {"New": "New(self, /) -> None: ..."},
+                "removed": {"Old": "Old(self, /) -> None: ..."},
+                "changed": {
+                    "Bar": {
+                        "old": "Bar(self, /, x: int) -> VideoNode: ...",
+                        "new": "Bar(self, /, y: int) -> VideoNode: ...",
+                    }
+                },
+            }
+        },
+        "description": {"old": "Foo", "new": "Foo plugin"},
+    }
+
+    # Only the decorator differs
+    wrapped = old._replace(
+        functions={"VideoNode": [WrappedFunction("Bar(self, /) -> VideoNode: ...", "_Wrapper.Other")]}
+    )
+    assert _diff_plugins(old._replace(functions={"VideoNode": old.functions["VideoNode"]}), wrapped) == {
+        "functions": {
+            "VideoNode": {
+                "added": {},
+                "removed": {},
+                "changed": {
+                    "Bar": {
+                        "old": "Bar(self, /) -> VideoNode: ...",
+                        "new": "Bar(self, /) -> VideoNode: ...",
+                        "wrapper": {"old": "_Wrapper.Function", "new": "_Wrapper.Other"},
+                    }
+                },
+            }
+        }
+    }
+
+
+def test_check_stubs_stop_early(mocker: MockerFixture) -> None:
+    def impl(ns: str, func: str) -> Implementation:
+        return Implementation(ns, {"Core": [WrappedFunction(f"{func}(self, /) -> None: ...")]}, ns)
+
+    mocker.patch(
+        "vsstubs.func.get_implementations_from_input", return_value=[impl("alpha", "Old"), impl("beta", "Old")]
+    )
+    context = GenerationContext()
+    mocker.patch.object(context, "plugins", return_value=[SimpleNamespace(namespace=ns) for ns in ["alpha", "beta"]])
+    mocker.patch.object(context, "cores", return_value=[])
+    introspect = mocker.patch(
+        "vsstubs.stubs.iter_plugin_interfaces",
+        side_effect=lambda plugins, *_, **__: (PluginInterface(p.namespace, {}, p.namespace) for p in plugins),
+    )
+    mocker.patch("vsstubs.stubs.construct_implementation", side_effect=lambda p, **_: impl(p.namespace, "New"))
+
+    out = check_stubs(StringIO(""), stop_early=True, context=context)
+
+    assert out["modified"] == ["alpha"]
+    assert introspect.call_count == 1
+
+
+def test_output_stubs_incremental_update(tmp_path: Path, mocker: MockerFixture) -> None:
+    def interface(ns: str, param: str) -> PluginInterface:
+        signature = Signature([Parameter(param, Parameter.KEYWORD_ONLY, annotation=int)], return_annotation=VideoNode)
+        return PluginInterface(ns, {"Core": [FunctionInterface("Filter", signature)]}, ns)
+
+    get_pinters = mocker.patch(
+        "vsstubs.func._get_pinters", return_value=[interface(f"plugin{i}", "x") for i in range(4)]
+    )
+    output_stubs(None, tmp_path / "old.pyi")
+
+    get_pinters.return_value = [interface(f"plugin{i}", "y" if i == 2 else "x") for i in range(4)]
+    fingerprint = mocker.spy(stubs, "get_fingerprint")
+    construct = mocker.spy(stubs, "_construct_implementation")
+
+    output_stubs(tmp_path / "old.pyi", tmp_path / "new.pyi", update=True, incremental=True)
+
+    # Each plugin is fingerprinted once and only the changed one is constructed, with the same fingerprint
+    assert fingerprint.call_count == 4
+    assert [call.args[0].namespace for call in construct.call_args_list] == ["plugin2"]
+
+    # Same as a full generation
+    output_stubs(None, tmp_path / "full.pyi")
+    assert (tmp_path / "new.pyi").read_text() == (tmp_path / "full.pyi").read_text()
+
+
+def test_no_autoload_introspects_in_a_worker(mocker: MockerFixture) -> None:
+    context = GenerationContext()
+    introspect = mocker.patch.object(
+        context, "introspect_isolated", return_value=SimpleNamespace(plugins=[PluginInterface("alpha", {}, "Alpha")])
+    )
+    disable = mocker.patch("vsstubs.utils._disable_autoloading")
+
+    assert list_plugins(autoload=False, context=context) == [{"namespace": "alpha", "description": "Alpha"}]
+
+    # The core of this process keeps autoloading the plugins
+    introspect.assert_called_once_with((), 1, DEFAULT_PLUGIN_TIMEOUT, False)
+    disable.assert_not_called()
@@ -0,0 +1,67 @@
+import threading
+from types import SimpleNamespace
+
+from pytest_mock import MockerFixture
+
+from vsstubs.context import GenerationContext
+from vsstubs.profiling import phase, profiling
+from vsstubs.types import parse_type
+
+
+def test_profiling_records_phases() -> None:
+    with phase("outside"):
+        pass
+
+    with profiling() as profiler:
+        with phase("construct", "std"):
+            parse_type(int)
+            parse_type(int)
+
+        with phase("construct", "akarin"):
+            pass
+
+    with phase("after"):
+        pass
+
+    report = profiler.report()
+
+    assert list(report["phases"]) == ["construct"]
+    assert report["phases"]["construct"]["calls"] == 2
+    assert list(report["plugins"]) == ["akarin", "std"]
+    assert report["caches"]["parse_type"]["hits"] >= 1
+
+
+def test_profiling_is_per_thread() -> None:
+    def run() -> None:
+        with phase("elsewhere"):
+            pass
+
+    with profiling() as profiler:
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        with phase("here"):
+            pass
+
+    assert list(profiler.report()["phases"]) == ["here"]
+
+
+def test_profiling_records_context_caches(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        GenerationContext, "core", new_callable=mocker.PropertyMock, return_value=SimpleNamespace(plugins=list)
+    )
+    context = GenerationContext()
+    has_dir = object()
+
+    with profiling() as profiler:
+        context.plugins()
+        context.plugins()
+        context.dir(has_dir)
+        context.dir(has_dir)
+        context.dir(object())
+
+    caches = profiler.report()["caches"]
+
+    assert caches["GenerationContext.plugins"] == {"hits": 1, "misses": 1, "ratio": 0.5, "size": 1}
+    assert caches["GenerationContext.dir"] == {"hits": 1, "misses": 2, "ratio": 0.3333, "size": 2}
@@ -0,0 +1,157 @@
+import timeit
+from collections.abc import Callable
+from inspect import Parameter, Signature
+from typing import Any, Union
+
+import pytest
+from vapoursynth import VideoNode
+
+from vsstubs.constants import _CORE_IMPL_END, _CORE_IMPL_START, _CORE_NAMES, _PLUGINS_IMPL_END, _PLUGINS_IMPL_START
+from vsstubs.document import MarkerIndex, get_implementations_from_input, parse_stub
+from vsstubs.stubs import (
+    construct_implementation,
+    splice_implementations,
+    write_implementations,
+    write_plugins_bound,
+    write_stubs,
+)
+from vsstubs.types import FunctionInterface, Implementation, PluginInterface, WrappedFunction
+
+# Wall-clock measurements, too noisy for every run: select them with `pytest -m slow`.
+pytestmark = pytest.mark.slow
+
+# The time of a stage is measured at N, 4N and 16N.
+# A linear stage takes 16 times longer at 16N, n log n sorting about 24 times and a quadratic one 256 times,
+# so the limit allows twice the linear growth.
+_SCALES = (1, 4, 16)
+_MAX_GROWTH = 32
+
+_TEMPLATE = "".join(
+    [
+        *(
+            f"class {core_name}:\n{_CORE_IMPL_START.format(core_name=core_name)}\n"
+            f"{_CORE_IMPL_END.format(core_name=core_name)}\n\n"
+            for core_name in _CORE_NAMES
+        ),
+        f"{_PLUGINS_IMPL_START}\n{_PLUGINS_IMPL_END}\n",
+    ]
+)
+
+
+def _assert_linear(stage: Callable[[Any], object], make_input: Callable[[int], Any], n: int) -> None:
+    timings = list[float]()
+
+    for scale in _SCALES:
+        data = make_input(n * scale)
+        timings.append(min(timeit.repeat(lambda: stage(data), number=1, repeat=5)))  # noqa: B023
+
+    assert timings[-1] / timings[0] < _MAX_GROWTH, [f"{t * 1e3:.2f} ms" for t in timings]
+
+
+def _make_implementations(n_plugins: int, n_params: int = 6) -> list[Implementation]:
+    params = ", ".join(f"param{i}: _IntLike | _SequenceLike[_IntLike] | None = None" for i in range(n_params))
+
+    return [
+        Implementation(
+            f"plugin{p:05}",
+            {
+                core_name: [WrappedFunction(f"Function{f}(self, /, clip: VideoNode, {params}) -> VideoNode: ...")]
+                for f, core_name in enumerate(_CORE_NAMES[:2])
+            },
+            f"Plugin number {p}",
+            [],
+        )
+        for p in range(n_plugins)
+    ]
+
+
+def _parse(text: str) -> list[Implementation]:
+    parse_stub.cache_clear()
+    return get_implementations_from_input(text)
+
+
+def test_parsing_scales_with_plugins() -> None:
+    _assert_linear(_parse, lambda n: write_stubs(_make_implementations(n), _TEMPLATE), 100)
+
+
+def test_rendering_scales_with_plugins() -> None:
+    for write in (write_implementations, write_plugins_bound, write_stubs):
+        # Reversed so that sorting the implementations has work to do
+        _assert_linear(
+            lambda impls, write=write: write(impls, _TEMPLATE), lambda n: _make_implementations(n)[::-1], 200
+        )
+
+
+def test_splicing_scales_with_plugins() -> None:
+    def make_input(n: int) -> tuple[Any, list[Implementation]]:
+        implementations = _make_implementations(n)
+        # Every block changes
+        changed = [impl._replace(fingerprint="0", description="Changed") for impl in implementations]
+        return parse_stub(write_stubs(implementations, _TEMPLATE)), changed
+
+    _assert_linear(lambda data: splice_implementations(*data), make_input, 100)
+
+
+def test_long_signatures() -> None:
+    # A single function whose signature grows
+    _assert_linear(_parse, lambda n: write_stubs(_make_implementations(1, n), _TEMPLATE), 500)
+
+    def make_interface(n: int) -> PluginInterface:
+        annotation = Union[int, float, VideoNode, None]  # noqa: UP007
+        signature = Signature(
+            [Parameter(f"param{i}", Parameter.KEYWORD_ONLY, annotation=annotation, default=None) for i in range(n)],
+            return_annotation=VideoNode,
+        )
+        return PluginInterface("plugin", {"VideoNode": [FunctionInterface("Function", signature)]}, "Plugin")
+
+    _assert_linear(lambda interface: construct_implementation(interface, compat=False), make_interface, 500)
+
+
+def test_signatures_spanning_many_lines() -> None:
+    def make_input(n: int) -> str:
+        params = ",\n".join(f"                param{i}: _IntLike | None = None" for i in range(n))
+        implementation = (
+            "# <implementation/plugin>\n"
+            "class _plugin:\n"
+            "    class _VideoNode_bound:\n"
+            "        class Plugin(_VSPlugin):\n"
+            "            @_Wrapper.Function\n"
+            f"            def Function(\n                self,\n{params},\n            ) -> VideoNode: ...\n"
+            "# </implementation/plugin>\n"
+        )
+        attribute = (
+            "# <attribute/VideoNode_bound/plugin>\n"
+            '    plugin: Final[_plugin._VideoNode_bound.Plugin]\n    """Plugin"""\n'
+            "# </attribute/VideoNode_bound/plugin>\n"
+        )
+        return _TEMPLATE.replace(f"{_PLUGINS_IMPL_START}\n", f"{_PLUGINS_IMPL_START}\n{implementation}").replace(
+            f"{_CORE_IMPL_START.format(core_name='VideoNode')}\n",
+            f"{_CORE_IMPL_START.format(core_name='VideoNode')}\n{attribute}",
+        )
+
+    _assert_linear(_parse, make_input, 500)
+
+
+def test_many_nested_classes() -> None:
+    def make_input(n: int) -> str:
+        # One plugin bound to a growing number of core-like classes
+        functions = {
+            core_name: [WrappedFunction("Function(self, /, clip: VideoNode) -> VideoNode: ...")]
+            for core_name in ["VideoNode", *(f"Core{c}" for c in range(n))]
+        }
+        return write_stubs([Implementation("plugin", functions, "Plugin", [])], _TEMPLATE)
+
+    _assert_linear(_parse, make_input, 200)
+
+
+def test_deeply_nested_markers() -> None:
+    def make_input(n: int) -> str:
+        # Nested blocks closed in order, then blocks left unclosed followed by stray closing markers
+        return (
+            "".join(f"# <block{i}>\n" for i in range(n))
+            + "".join(f"# </block{i}>\n" for i in reversed(range(n)))
+            + "".join(f"# <unclosed{i}>\n" for i in range(n))
+            + "".join(f"# </stray{i}>\n" for i in range(n))
+        )
+
+    _assert_linear(MarkerIndex, make_input, 500)
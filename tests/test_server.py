@@ -0,0 +1,56 @@
+import io
+import json
+from typing import Any
+
+from pytest_mock import MockerFixture
+
+from vsstubs.context import get_default_context
+from vsstubs.server import serve
+
+
+def _serve(*requests: Any) -> list[dict[str, Any]]:
+    stdin = io.StringIO("\n".join(r if isinstance(r, str) else json.dumps(r) for r in requests) + "\n")
+    stdout = io.StringIO()
+
+    serve(stdin, stdout)
+
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_serve_dispatch(mocker: MockerFixture) -> None:
+    check = mocker.patch("vsstubs.server.check_stubs", return_value={"old": [], "new": ["foo"], "modified": []})
+    output = mocker.patch("vsstubs.server.output_stubs", return_value=None)
+
+    responses = _serve(
+        {"jsonrpc": "2.0", "id": 1, "method": "check", "params": {"input": "a.pyi"}},
+        {"jsonrpc": "2.0", "id": 2, "method": "add", "params": {"plugins": ["foo"], "input": "a.pyi", "output": "@"}},
+        {"jsonrpc": "2.0", "method": "remove", "params": {"plugins": ["foo"], "input": "a.pyi", "output": "b.pyi"}},
+        {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+        {"jsonrpc": "2.0", "id": 4, "method": "check", "params": {"input": "a.pyi"}},
+    )
+
+    assert responses == [
+        {"jsonrpc": "2.0", "id": 1, "result": {"old": [], "new": ["foo"], "modified": []}},
+        {"jsonrpc": "2.0", "id": 2, "result": None},
+        {"jsonrpc": "2.0", "id": 3, "result": None},
+    ]
+    check.assert_called_once_with("a.pyi", cache=False, context=get_default_context())
+    assert output.call_count == 2
+    assert output.call_args_list[0].args == ("a.pyi", "a.pyi")
+    assert output.call_args_list[0].kwargs["add"] == {"foo"}
+    assert output.call_args_list[1].kwargs["remove"] == {"foo"}
+
+
+def test_serve_errors(mocker: MockerFixture) -> None:
+    mocker.patch("vsstubs.server.check_stubs", side_effect=FileNotFoundError("a.pyi"))
+
+    responses = _serve(
+        "{not json",
+        {"jsonrpc": "2.0", "id": 1, "method": "frobnicate"},
+        {"jsonrpc": "2.0", "id": 2, "method": "check", "params": {"wrong": 1}},
+        {"jsonrpc": "2.0", "id": 3, "method": "check", "params": {"input": "a.pyi"}},
+        {"jsonrpc": "2.0", "id": 4, "method": "update", "params": {"input": "a.pyi", "output": "-"}},
+    )
+
+    assert [r["error"]["code"] for r in responses] == [-32700, -32601, -32602, -32000, -32000]
+    assert [r["id"] for r in responses] == [None, 1, 2, 3, 4]
@@ -0,0 +1,31 @@
+from inspect import Parameter, Signature
+
+import pytest
+from vapoursynth import VideoNode
+
+from vsstubs.snapshot import dump_snapshot, load_snapshot
+from vsstubs.types import FunctionInterface, PluginInterface
+
+
+def test_snapshot_roundtrip() -> None:
+    sig = Signature(
+        [
+            Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode),
+            Parameter("strength", Parameter.POSITIONAL_OR_KEYWORD, annotation=float | None, default=None),
+        ],
+        return_annotation=VideoNode,
+    )
+    foo = PluginInterface("foo", {"VideoNode": [FunctionInterface("Bar", sig)]}, "Foo plugin")
+    # A list default can't be serialized
+    unserializable = Signature([Parameter("x", Parameter.POSITIONAL_OR_KEYWORD, default=[1])])
+    bad = PluginInterface("bad", {"Core": [FunctionInterface("Baz", unserializable)]}, "Bad plugin")
+
+    text, skipped = dump_snapshot([foo, bad])
+
+    assert list(skipped) == ["bad"]
+    assert load_snapshot(text) == [foo]
+
+
+def test_snapshot_unsupported_version() -> None:
+    with pytest.raises(ValueError, match="Unsupported snapshot version"):
+        load_snapshot('{"version": 0, "plugins": []}')
@@ -1,9 +1,20 @@
+import io
 from inspect import Parameter, Signature
+from typing import TypedDict
 
+import pytest
 from vapoursynth import VideoNode
 
-from vsstubs.stubs import construct_implementation, get_implementations_from_input
-from vsstubs.types import FunctionInterface, PluginInterface
+from vsstubs.document import get_implementations_from_input, parse_stub
+from vsstubs.stubs import (
+    _render_signature,
+    construct_implementation,
+    construct_implementations,
+    splice_implementations,
+    stream_stubs,
+    write_stubs,
+)
+from vsstubs.types import Attribute, FunctionInterface, Implementation, PluginInterface, WrappedFunction
 
 
 def test_construct_implementation() -> None:
@@ -63,3 +74,137 @@ class _std:
         "Blur(self, clip: VideoNode, radius: _IntLike = 1) -> VideoNode: ..."
         in impl.functions["VideoNode"][0].signature
     )
+
+
+def test_splice_implementations() -> None:
+    def make(ns: str, fingerprint: str, func: str) -> Implementation:
+        return Implementation(
+            ns,
+            {"VideoNode": [WrappedFunction(f"{func}(self, /, clip: VideoNode) -> VideoNode: ...")]},
+            ns,
+            [],
+            fingerprint,
+        )
+
+    def render(implementations: list[Implementation]) -> str:
+        attrs = "".join(Attribute(i.namespace, "VideoNode", i.description).as_stub() for i in implementations)
+        impls = "\n".join(i.as_stub() for i in implementations)
+        return (
+            f"# <plugins/bound/VideoNode>\n{attrs}# </plugins/bound/VideoNode>\n\n"
+            f"# <plugins/implementations>\n{impls}\n# </plugins/implementations>\n"
+        )
+
+    old = [make("akarin", "aaaa", "Expr"), make("std", "bbbb", "Blur")]
+    text = render(old)
+
+    assert [i.fingerprint for i in get_implementations_from_input(text)] == ["aaaa", "bbbb"]
+    assert splice_implementations(parse_stub(text), old) == text
+
+    new = [old[0], make("std", "cccc", "BoxBlur")]
+    assert splice_implementations(parse_stub(text), new) == render(new)
+
+    # Removing a plugin needs a full render
+    assert splice_implementations(parse_stub(text), new[1:]) is None
+
+    # A rebuilt library with the same signatures only needs its key updated
+    rebuilt = [old[0]._replace(library="dddd"), old[1]]
+    spliced = splice_implementations(parse_stub(text), rebuilt)
+
+    assert spliced == render(rebuilt)
+    assert parse_stub(spliced).library_keys() == {"akarin": "dddd", "std": None}
+
+
+def test_write_stubs() -> None:
+    template = (
+        "class VideoNode:\n"
+        "# <plugins/bound/VideoNode>\n# </plugins/bound/VideoNode>\n\n"
+        "# <plugins/implementations>\n# </plugins/implementations>\n"
+    )
+    implementations = [
+        Implementation(ns, {"VideoNode": [WrappedFunction("Blur(self, /, clip: VideoNode) -> VideoNode: ...")]}, doc)
+        for ns, doc in [("std", "Standard plugins"), ("akarin", r"Expr with \d escapes")]
+    ]
+    attrs = "".join(Attribute(i.namespace, "VideoNode", i.description).as_stub() for i in implementations[::-1])
+    impls = "\n".join(i.as_stub() for i in implementations[::-1])
+
+    assert write_stubs(implementations, template) == (
+        "class VideoNode:\n"
+        f"# <plugins/bound/VideoNode>\n{attrs}# </plugins/bound/VideoNode>\n\n"
+        f"# <plugins/implementations>\n{impls}\n# </plugins/implementations>\n"
+    )
+
+
+def test_stream_stubs() -> None:
+    template = (
+        "# <plugins/bound/Core>\n# </plugins/bound/Core>\n\n"
+        "# <plugins/bound/VideoNode>\n# </plugins/bound/VideoNode>\n\n"
+        "# <plugins/implementations>\n# </plugins/implementations>\n"
+    )
+    sig = Signature(
+        [Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode)], return_annotation=VideoNode
+    )
+    interfaces = [
+        PluginInterface("akarin", {"VideoNode": [FunctionInterface("Expr", sig)]}, "Akarin"),
+        PluginInterface("std", {"Core": [FunctionInterface("Blur", sig)], "VideoNode": []}, "Standard plugins"),
+    ]
+
+    output = io.StringIO()
+    stream_stubs(iter(interfaces), template, output, compat=False)
+
+    assert output.getvalue() == write_stubs(
+        [construct_implementation(interface, compat=False) for interface in interfaces], template
+    )
+
+    with pytest.raises(ValueError, match="sorted"):
+        stream_stubs(interfaces[::-1], template, io.StringIO(), compat=False)
+
+
+def test_render_signature_matches_str_signature() -> None:
+    params = [
+        Parameter("a", Parameter.POSITIONAL_ONLY),
+        Parameter("b", Parameter.POSITIONAL_OR_KEYWORD, default=1),
+        Parameter("args", Parameter.VAR_POSITIONAL, annotation=int),
+        Parameter("k", Parameter.KEYWORD_ONLY, annotation=str, default="x"),
+        Parameter("kwargs", Parameter.VAR_KEYWORD),
+    ]
+    self_param = Parameter("self", Parameter.POSITIONAL_ONLY)
+
+    for sig in [
+        Signature(params, return_annotation=VideoNode),
+        Signature(params[1:2]),
+        Signature(params[3:]),
+        Signature(),
+    ]:
+        expected = str(sig.replace(parameters=[self_param, *sig.parameters.values()]))
+        rendered = _render_signature(((p, p.annotation) for p in sig.parameters.values()), sig.return_annotation)
+
+        assert rendered == expected
+
+
+def test_construct_implementations_with_jobs() -> None:
+    # A local class can't be pickled, so its plugin is constructed in the current process.
+    class Props(TypedDict):
+        radius: int
+
+    interfaces = [
+        PluginInterface(
+            namespace,
+            {
+                "VideoNode": [
+                    FunctionInterface(
+                        "Blur",
+                        Signature(
+                            [Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode)],
+                            return_annotation=return_annotation,
+                        ),
+                    )
+                ]
+            },
+            namespace,
+        )
+        for namespace, return_annotation in [("b", VideoNode), ("a", Props), ("c", VideoNode)]
+    ]
+
+    assert construct_implementations(interfaces, compat=False, jobs=2) == [
+        construct_implementation(interface, compat=False) for interface in interfaces
+    ]
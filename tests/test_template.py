@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from vsstubs.template import _merge_template, get_template
+from vsstubs.utils import _get_cache_dir
+
+
+def test_get_template_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture) -> None:
+    monkeypatch.setenv("VSSTUBS_CACHE_DIR", str(tmp_path))
+    _get_cache_dir.cache_clear()
+    get_template.cache_clear()
+
+    tmpl = get_template()
+
+    assert tmpl == _merge_template()
+    assert [p.read_text() for p in (tmp_path / "template").iterdir()] == [tmpl]
+
+    get_template.cache_clear()
+    merge = mocker.patch("vsstubs.template._merge_template")
+
+    assert get_template() == tmpl
+    merge.assert_not_called()
+
+    get_template.cache_clear()
+    _get_cache_dir.cache_clear()
@@ -1,7 +1,11 @@
 import collections.abc
+import copy
+import json
+import pickle
 import sys
 from collections.abc import Callable
-from types import GenericAlias
+from inspect import Parameter, Signature
+from types import GenericAlias, NoneType
 from typing import Union
 
 from vapoursynth import AudioNode, VideoNode
@@ -10,7 +14,9 @@ from vsstubs.types import (
     AnyStr,
     AudioNodeType,
     FloatLike,
+    FunctionInterface,
     IntLike,
+    PluginInterface,
     SequenceLike,
     UnionLike,
     VideoNodeType,
@@ -64,3 +70,58 @@ def test_parse_type_callable() -> None:
 def test_sequence_like_repr() -> None:
     s = SequenceLike([IntLike()])
     assert repr(s) == "_SequenceLike[_IntLike]"
+
+
+def test_type_likes_are_interned() -> None:
+    assert IntLike() is IntLike()
+    assert SequenceLike([IntLike()]) is SequenceLike((IntLike(),))
+    assert VSCallbackTypeLike("_VSCallback_std_FrameEval_eval") is VSCallbackTypeLike("_VSCallback_std_FrameEval_eval")
+    assert VSCallbackTypeLike() is not VSCallbackTypeLike("_VSCallback_std_FrameEval_eval")
+    assert len({parse_type(Union[int, None]), parse_type(Union[int, None], True)}) == 1  # noqa: UP007
+
+
+def test_type_likes_pickle_and_copy() -> None:
+    type_likes = [
+        IntLike(),
+        SequenceLike([IntLike(), FloatLike()]),
+        VSCallbackTypeLike("_VSCallback_std_FrameEval_eval"),
+    ]
+
+    if sys.version_info < (3, 14):
+        type_likes.append(UnionLike(IntLike(), NoneType))
+
+    for type_like in type_likes:
+        assert pickle.loads(pickle.dumps(type_like)) is type_like
+        assert copy.copy(type_like) is type_like
+        assert copy.deepcopy(type_like) is type_like
+
+    # Copying doesn't overwrite the other interned instances
+    assert repr(SequenceLike([FloatLike()])) == "_SequenceLike[_FloatLike]"
+
+
+def test_function_interface_roundtrip() -> None:
+    sig = Signature(
+        [
+            Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=VideoNode),
+            Parameter(
+                "planes",
+                Parameter.POSITIONAL_OR_KEYWORD,
+                annotation=Union[int, collections.abc.Sequence[int], None],  # noqa: UP007
+                default=None,
+            ),
+        ],
+        return_annotation=VideoNode,
+    )
+    func = FunctionInterface("Blur", sig)
+
+    loaded = FunctionInterface.from_dict(json.loads(json.dumps(func.as_dict())))
+
+    assert loaded == func
+    assert str(loaded.signature) == str(sig)
+
+
+def test_plugin_interface_roundtrip() -> None:
+    sig = Signature([Parameter("clip", Parameter.POSITIONAL_OR_KEYWORD, annotation=AudioNode)])
+    pinter = PluginInterface("std", {"AudioNode": [FunctionInterface("AudioReverse", sig)]}, "Standard plugins")
+
+    assert PluginInterface.from_dict(pinter.as_dict()) == pinter
@@ -1,9 +1,20 @@
+import os
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import pytest
 import pytest_mock
 
-from vsstubs.utils import _get_default_stubs_path, _index_by_namespace, running_via_cli
+from vsstubs.utils import (
+    _disable_autoloading,
+    _get_default_stubs_path,
+    _get_new_file_mode,
+    _get_umask,
+    _index_by_namespace,
+    _write_text_if_changed,
+    running_via_cli,
+)
 
 
 def test_index_by_namespace() -> None:
@@ -52,3 +63,49 @@ def test_get_default_stubs_path(mocker: pytest_mock.MockerFixture) -> None:
     _get_default_stubs_path.cache_clear()
     path = _get_default_stubs_path()
     assert str(path).startswith("usersite")
+
+
+def test_write_text_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "__init__.pyi"
+    path.write_text("old")
+    path.chmod(0o644)
+
+    assert _write_text_if_changed(path, "new") is True
+    assert path.read_text() == "new"
+    assert path.stat().st_mode & 0o777 == 0o644
+
+    mtime = path.stat().st_mtime_ns
+
+    assert _write_text_if_changed(path, "new") is False
+    assert path.stat().st_mtime_ns == mtime
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_new_file_mode(tmp_path: Path, mocker: pytest_mock.MockerFixture) -> None:
+    umask = mocker.spy(os, "umask")
+
+    if sys.platform == "linux":
+        _get_umask.cache_clear()
+        assert _get_umask() is not None
+        umask.assert_not_called()
+
+    # Without the umask, the files already in the folder are followed
+    mocker.patch("vsstubs.utils._get_umask", return_value=None)
+    assert _get_new_file_mode(tmp_path) == 0o644
+
+    (tmp_path / ".stubs.pyi.tmp").touch(mode=0o600)
+    (tmp_path / "stubs.pyi").touch(mode=0o640)
+    assert _get_new_file_mode(tmp_path) == 0o640
+
+    umask.assert_not_called()
+
+
+def test_disable_autoloading_after_core(mocker: pytest_mock.MockerFixture) -> None:
+    mocker.patch("vsstubs.utils._AUTOLOADING_DISABLED", False)
+    mocker.patch("vapoursynth.has_policy", return_value=True)
+    register_policy = mocker.patch("vapoursynth.register_policy")
+
+    with pytest.raises(ValueError, match="can't be disabled"):
+        _disable_autoloading()
+
+    register_policy.assert_not_called()
@@ -0,0 +1,70 @@
+import base64
+import hashlib
+import zipfile
+from pathlib import Path
+
+from vsstubs.func import build_wheel
+from vsstubs.wheel import get_wheel_version, write_wheel
+
+
+def test_write_wheel(tmp_path: Path) -> None:
+    wheel_path = write_wheel(tmp_path, "def foo() -> None: ...\n", "1.2.3.20260101000000")
+
+    assert wheel_path == tmp_path / "vapoursynth_stubs-1.2.3.20260101000000-py3-none-any.whl"
+    assert list(tmp_path.iterdir()) == [wheel_path]
+
+    with zipfile.ZipFile(wheel_path) as zf:
+        dist_info = "vapoursynth_stubs-1.2.3.20260101000000.dist-info"
+
+        assert zf.read("vapoursynth-stubs/__init__.pyi") == b"def foo() -> None: ...\n"
+        assert b"Name: vapoursynth-stubs\nVersion: 1.2.3.20260101000000\n" in zf.read(f"{dist_info}/METADATA")
+        assert b"Tag: py3-none-any\n" in zf.read(f"{dist_info}/WHEEL")
+
+        record = zf.read(f"{dist_info}/RECORD").decode().splitlines()
+
+        assert record[-1] == f"{dist_info}/RECORD,,"
+        assert sorted(line.split(",")[0] for line in record) == sorted(zf.namelist())
+
+        for line in record[:-1]:
+            name, digest, size = line.split(",")
+            data = zf.read(name)
+            expected = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+
+            assert digest == f"sha256={expected}"
+            assert int(size) == len(data)
+
+
+def test_write_wheel_reproducible(tmp_path: Path) -> None:
+    first = write_wheel(tmp_path / "a", "x: int\n", "1.0").read_bytes()
+    second = write_wheel(tmp_path / "b", "x: int\n", "1.0").read_bytes()
+
+    assert first == second
+
+
+def test_build_wheel_reuses_same_content(tmp_path: Path) -> None:
+    first, written = build_wheel(tmp_path, "x: int\n")
+    mtime = Path(first).stat().st_mtime_ns
+
+    assert written
+    assert build_wheel(tmp_path, "x: int\n") == (first, False)
+    assert Path(first).stat().st_mtime_ns == mtime
+
+    other, _ = build_wheel(tmp_path, "x: str\n")
+
+    assert other != first
+    assert get_wheel_version("x: int\n").split("+")[1] in first
+
+
+def test_build_wheel_prunes_outdated_wheels(tmp_path: Path) -> None:
+    first, _ = build_wheel(tmp_path, "x: int\n", prune=True)
+    (tmp_path / "other.whl").touch()
+
+    second, _ = build_wheel(tmp_path, "x: str\n", prune=True)
+
+    assert not Path(first).exists()
+    assert sorted(tmp_path.iterdir()) == sorted([Path(second), tmp_path / "other.whl"])
+
+    # Without pruning, the wheels are kept
+    third, _ = build_wheel(tmp_path, "x: float\n")
+
+    assert {Path(second), Path(third)} <= set(tmp_path.iterdir())
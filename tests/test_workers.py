@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from vsstubs.types import PluginInterface
+from vsstubs.workers import _BUILTINS, _LIBRARY_SUFFIX, _autoload_dirs, _merge_results, introspect_plugins
+
+
+def test_introspect_plugins_builtins() -> None:
+    result = introspect_plugins(autoload=False, jobs=2)
+
+    assert "std" in {p.namespace for p in result.plugins}
+    assert [p.namespace for p in result.plugins] == sorted(p.namespace for p in result.plugins)
+    assert not result.loaded
+    assert not result.skipped
+
+
+def test_introspect_plugins_skips_invalid_library(tmp_path: Path) -> None:
+    library = tmp_path / f"invalid{_LIBRARY_SUFFIX}"
+    library.write_text("not a plugin")
+
+    result = introspect_plugins([tmp_path], autoload=False, jobs=1, timeout=30)
+
+    assert "std" in {p.namespace for p in result.plugins}
+    assert not result.loaded
+    assert list(result.skipped) == [str(library.resolve())]
+
+
+def test_introspect_plugins_shards_autoloaded_libraries(tmp_path: Path, mocker: MockerFixture) -> None:
+    autoload_dir = tmp_path / "autoload"
+    autoload_dir.mkdir()
+    library = autoload_dir / f"invalid{_LIBRARY_SUFFIX}"
+    library.write_text("not a plugin")
+    mocker.patch("vsstubs.workers._autoload_dirs", return_value=[autoload_dir])
+
+    result = introspect_plugins(autoload=True, jobs=2, timeout=30)
+
+    # The failing library is skipped alone, the others are still introspected
+    assert "std" in {p.namespace for p in result.plugins}
+    assert list(result.skipped) == [str(library.resolve())]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="vapoursynth.conf is only read on Linux and macOS")
+def test_autoload_dirs(tmp_path: Path, mocker: MockerFixture) -> None:
+    user_dir, system_dir = tmp_path / "user", tmp_path / "system"
+    user_dir.mkdir()
+    system_dir.mkdir()
+
+    mocker.patch("vsstubs.workers._read_vs_config", return_value={"UserPluginDir": str(user_dir)})
+    mocker.patch("vsstubs.workers._get_plugin_dir", return_value=str(system_dir))
+    assert _autoload_dirs() == [user_dir, system_dir]
+
+    mocker.patch(
+        "vsstubs.workers._read_vs_config",
+        return_value={"UserPluginDir": str(user_dir), "AutoloadSystemPluginDir": "false"},
+    )
+    assert _autoload_dirs() == [user_dir]
+
+
+def test_merge_results() -> None:
+    def plugin(namespace: str) -> dict[str, object]:
+        return PluginInterface(namespace, {}, namespace.upper()).as_dict()
+
+    result = _merge_results(
+        [_BUILTINS, "/b.so", "/a.so"],
+        {
+            "/z.so": [plugin("foo")],
+            _BUILTINS: [plugin("std")],
+            "/a.so": [plugin("foo")],
+            "/b.so": [plugin("bar")],
+            "/y.so": [plugin("baz")],
+        },
+        {"/c.so": "Timed out"},
+    )
+
+    assert [p.namespace for p in result.plugins] == ["bar", "baz", "foo", "std"]
+    assert result.loaded == {"bar", "foo"}
+    assert result.skipped == {"/c.so": "Timed out", "/z.so": 'Namespace "foo" is already provided by /a.so'}